@@ -0,0 +1,45 @@
+"""Unique (source, source_id) on engagement_posts
+
+Revision ID: 3b9d2e7f5a10
+Revises: 7c1e5b2a9d44
+Create Date: 2026-10-18 16:41:05.502117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d2e7f5a10'
+down_revision: Union[str, Sequence[str], None] = '7c1e5b2a9d44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drop duplicates left by the old check-then-insert path, keeping the latest fetch.
+    # fetched_at is nullable: NULLs rank last so every duplicate group keeps exactly one row
+    op.execute("""
+        DELETE FROM engagement_posts
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY source, source_id
+                    ORDER BY fetched_at DESC NULLS LAST, id DESC
+                ) AS rn
+                FROM engagement_posts
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+    op.create_unique_constraint(
+        'uq_engagement_posts_source_source_id', 'engagement_posts', ['source', 'source_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_engagement_posts_source_source_id', 'engagement_posts', type_='unique')
@@ -0,0 +1,28 @@
+"""Add content_hash to matches
+
+Revision ID: 7c1e5b2a9d44
+Revises: 0f27468b03af
+Create Date: 2026-10-18 09:12:40.118223
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5b2a9d44'
+down_revision: Union[str, Sequence[str], None] = '0f27468b03af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('matches', sa.Column('content_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('matches', 'content_hash')
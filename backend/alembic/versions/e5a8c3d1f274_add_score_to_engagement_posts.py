@@ -0,0 +1,40 @@
+"""Add ranked-feed score to engagement_posts
+
+Revision ID: e5a8c3d1f274
+Revises: 3b9d2e7f5a10
+Create Date: 2026-10-18 19:12:37.884310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a8c3d1f274'
+down_revision: Union[str, Sequence[str], None] = '3b9d2e7f5a10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('engagement_posts', sa.Column('score', sa.Float(), server_default='0', nullable=False))
+    # Backfill with the same formula as app.services.engagement_ranking.engagement_score
+    op.execute("""
+        UPDATE engagement_posts SET score =
+            log(2.0, (1
+                + 1.0 * COALESCE((metrics->>'likes')::float, 0)
+                + 2.0 * COALESCE((metrics->>'shares')::float, 0)
+                + 1.5 * COALESCE((metrics->>'comments')::float, 0)
+                + 0.01 * COALESCE((metrics->>'views')::float, 0))::numeric)::float
+            + extract(epoch FROM COALESCE(published_at, fetched_at)) / 43200.0
+    """)
+    op.create_index('ix_engagement_posts_score_id', 'engagement_posts', ['score', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_engagement_posts_score_id', table_name='engagement_posts')
+    op.drop_column('engagement_posts', 'score')
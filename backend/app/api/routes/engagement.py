@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Literal, Optional
 from datetime import datetime
-import json
 
+from app.core.serialization import RawJSONResponse, dumps_str
 from app.infrastructure.db import get_db
-from app.infrastructure.redis_client import get_json, set_json
+from app.infrastructure.tiered_cache import cache
 from app.models.sql_engagement import EngagementPost
 from app.domain.models.engagement_view import (
     EngagementFeedResponse, 
@@ -17,25 +19,44 @@ from app.domain.models.engagement_view import (
 router = APIRouter(prefix="/api/v1/engagement", tags=["Engagement"])
 
 @router.get("/feed", response_model=EngagementFeedResponse)
-def get_engagement_feed(
+async def get_engagement_feed(
     source: Optional[str] = Query(None, description="Filter by 'twitter' or 'youtube'"),
     limit: int = Query(20, le=50, description="Items per page"),
-    cursor: Optional[str] = Query(None, description="Timestamp cursor for pagination"),
+    cursor: Optional[str] = Query(None, description="Cursor for pagination (from pagination.next_cursor)"),
+    sort: Literal["latest", "ranked"] = Query("latest", description="'latest' (newest first) or 'ranked' (time-decayed engagement)"),
     db: Session = Depends(get_db)
 ):
     """
     Returns a unified feed of Tweets and YouTube videos.
     - Cached: 1st page is cached for 5 minutes.
-    - Pagination: Uses 'published_at' cursor for infinite scroll.
+    - Pagination: Uses 'published_at' cursor for infinite scroll, or a
+      '(score, id)' keyset cursor when sort=ranked.
     """
     
-    #Redis Cache Check (Only for fresh feed i.e., no cursor)
-    cache_key = f"engagement:feed:{source or 'all'}:{limit}"
+    #L1/Redis Cache Check (Only for fresh feed i.e., no cursor)
+    cache_key = f"engagement:feed:{sort}:{source or 'all'}:{limit}"
     if not cursor:
-        cached_data = get_json(cache_key)
-        if cached_data:
-            return cached_data
+        cached_body = await cache.get_text(cache_key)
+        if cached_body:
+            return RawJSONResponse(cached_body)
 
+    #Blocking SQL runs in the threadpool, not on the event loop
+    response_data = await run_in_threadpool(build_engagement_feed, db, source, limit, cursor, sort)
+
+    #Save Fresh Feed to Redis (TTL 5 mins), pre-encoded so hits are sent verbatim
+    body = dumps_str(response_data.model_dump(mode='json'))
+    if not cursor and response_data.data:
+        await cache.set_text(cache_key, body, ttl=300)
+
+    return RawJSONResponse(body)
+
+def _ranked_cursor(post: EngagementPost) -> str:
+    # repr() round-trips the float exactly, so the next page starts right after this row
+    return f"{post.score!r}|{post.id}"
+
+def build_engagement_feed(
+    db: Session, source: Optional[str], limit: int, cursor: Optional[str], sort: str = "latest"
+) -> EngagementFeedResponse:
     #Build Database Query
     query = db.query(EngagementPost)
     
@@ -43,8 +64,22 @@ def get_engagement_feed(
     if source:
         query = query.filter(EngagementPost.source == source)
     
+    order = (EngagementPost.published_at.desc(),)
+
+    #Ranked: keyset on (score, id), served by ix_engagement_posts_score_id
+    if sort == "ranked":
+        if cursor:
+            try:
+                cursor_score, cursor_id = cursor.split("|", 1)
+                query = query.filter(
+                    tuple_(EngagementPost.score, EngagementPost.id) < (float(cursor_score), cursor_id)
+                )
+            except ValueError:
+                pass #Ignore invalid cursor
+        order = (EngagementPost.score.desc(), EngagementPost.id.desc())
+
     #Cursor Pagination logic (fetch items older than cursor)
-    if cursor:
+    elif cursor:
         try:
             #Parse ISO string back to datetime
             cursor_dt = datetime.fromisoformat(cursor)
@@ -54,7 +89,7 @@ def get_engagement_feed(
 
     #Sort & Limit
     #Fetch 1 extra item to check if next page exists
-    posts = query.order_by(EngagementPost.published_at.desc())\
+    posts = query.order_by(*order)\
                  .limit(limit + 1)\
                  .all()
 
@@ -64,9 +99,11 @@ def get_engagement_feed(
     
     next_cursor = None
     if has_next and results:
-        # The cursor for the next page is the timestamp of the last item
+        # The cursor for the next page is the timestamp (or rank) of the last item
         last_item = results[-1]
-        if last_item.published_at:
+        if sort == "ranked":
+            next_cursor = _ranked_cursor(last_item)
+        elif last_item.published_at:
             next_cursor = last_item.published_at.isoformat()
 
     #Map to Pydantic Response
@@ -91,13 +128,7 @@ def get_engagement_feed(
         )
         response_items.append(item)
 
-    response_data = EngagementFeedResponse(
+    return EngagementFeedResponse(
         data=response_items,
         pagination=PaginationInfo(next_cursor=next_cursor)
-    )
-
-    #Save Fresh Feed to Redis (TTL 5 mins)
-    if not cursor and response_items:
-        set_json(cache_key, response_data.model_dump(mode='json'), ttl=300)
-
-    return response_data
\ No newline at end of file
+    )
\ No newline at end of file
@@ -49,7 +49,7 @@ from app.core.config import settings
 @router.get("/sync")
 async def trigger_schedule_sync(
     authorization: str = Header(None),
-    db: Session = Depends(get_db)
+    full: bool = False
 ):
     """
     Protected endpoint to trigger fixture sync.
@@ -63,6 +63,6 @@ async def trigger_schedule_sync(
     if not cron_secret or token != cron_secret:
         raise HTTPException(status_code=403, detail="Invalid cron token")
 
-    await sync_schedules_to_db(db)
+    counts = await sync_schedules_to_db(force_full=full, force_hot=True)
     
-    return {"status": "success", "message": "Schedule sync triggered"}
\ No newline at end of file
+    return {"status": "success", "message": "Schedule sync triggered", "counts": counts}
\ No newline at end of file
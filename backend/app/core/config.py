@@ -16,4 +16,98 @@ class Settings:
     TWITTER_HOST = os.getenv("TWITTER_HOST", "twitter241.p.rapidapi.com")
     YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY", "")
 
+    # Live poller mode: "single_shot" normalizes the /livescores list directly,
+    # "detail" re-fetches /fixtures/{id} for every live match
+    LIVE_POLL_MODE = os.getenv("LIVE_POLL_MODE", "single_shot")
+
+    # Live poller fan-out (max in-flight detail fetches + per-request deadline in seconds)
+    LIVE_POLL_CONCURRENCY = int(os.getenv("LIVE_POLL_CONCURRENCY", "8"))
+    LIVE_POLL_REQUEST_TIMEOUT = float(os.getenv("LIVE_POLL_REQUEST_TIMEOUT", "8"))
+
+    # Thread pool for blocking SQLAlchemy work in background jobs
+    DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "4"))
+
+    # Rows per multi-VALUES upsert statement in the schedule sync
+    SCHEDULE_SYNC_CHUNK_SIZE = int(os.getenv("SCHEDULE_SYNC_CHUNK_SIZE", "200"))
+
+    # Incremental schedule sync: the hot band (recent past + next few days) is
+    # refreshed every SCHEDULE_HOT_SYNC_MINUTES, the full +/-30 day window only
+    # once it is older than SCHEDULE_FULL_SYNC_HOURS
+    SCHEDULE_HOT_PAST_DAYS = int(os.getenv("SCHEDULE_HOT_PAST_DAYS", "2"))
+    SCHEDULE_HOT_FUTURE_DAYS = int(os.getenv("SCHEDULE_HOT_FUTURE_DAYS", "3"))
+    SCHEDULE_HOT_SYNC_MINUTES = int(os.getenv("SCHEDULE_HOT_SYNC_MINUTES", "15"))
+    SCHEDULE_FULL_SYNC_HOURS = int(os.getenv("SCHEDULE_FULL_SYNC_HOURS", "24"))
+
+    # Seconds a worker holds a poller's leader lock before it must renew
+    LEADER_LOCK_TTL = int(os.getenv("LEADER_LOCK_TTL", "30"))
+
+    # In-process L1 cache in front of Redis (entries per worker, max seconds per entry)
+    L1_CACHE_MAX_ENTRIES = int(os.getenv("L1_CACHE_MAX_ENTRIES", "1024"))
+    L1_CACHE_TTL = float(os.getenv("L1_CACHE_TTL", "5"))
+
+    # Seconds an expired match detail may still be served while one request refreshes it
+    MATCH_DETAIL_STALE_SECONDS = int(os.getenv("MATCH_DETAIL_STALE_SECONDS", "300"))
+    # Finished scorecards are immutable; cache them long
+    MATCH_DETAIL_FINISHED_TTL = int(os.getenv("MATCH_DETAIL_FINISHED_TTL", str(7 * 86400)))
+    # Highlights search backoff after a miss (doubles per attempt up to the max)
+    HIGHLIGHTS_RETRY_BASE_SECONDS = int(os.getenv("HIGHLIGHTS_RETRY_BASE_SECONDS", "600"))
+    HIGHLIGHTS_RETRY_MAX_SECONDS = int(os.getenv("HIGHLIGHTS_RETRY_MAX_SECONDS", "86400"))
+
+    # Encoding of live:match:{id} values: "json" or "binary" (compact struct layout).
+    # Readers accept both, so this can be flipped without flushing Redis.
+    LIVE_SNAPSHOT_CODEC = os.getenv("LIVE_SNAPSHOT_CODEC", "json")
+
+    # Adaptive scheduler (seconds): live poll cadence in play / during breaks / with nothing live
+    LIVE_POLL_INTERVAL_LIVE = float(os.getenv("LIVE_POLL_INTERVAL_LIVE", "20"))
+    LIVE_POLL_INTERVAL_BREAK = float(os.getenv("LIVE_POLL_INTERVAL_BREAK", "90"))
+    LIVE_POLL_INTERVAL_IDLE = float(os.getenv("LIVE_POLL_INTERVAL_IDLE", "1800"))
+    # +/- fraction of each interval, so jobs and workers don't fire in lockstep
+    SCHEDULER_JITTER = float(os.getenv("SCHEDULER_JITTER", "0.1"))
+    TWITTER_POLL_MINUTES = int(os.getenv("TWITTER_POLL_MINUTES", "90"))
+    YOUTUBE_POLL_MINUTES = int(os.getenv("YOUTUBE_POLL_MINUTES", "20"))
+    NEWS_POLL_MINUTES = int(os.getenv("NEWS_POLL_MINUTES", "240"))
+
+    # Upstream quota budgets (token buckets shared across workers via Redis).
+    # Burst caps how much of a day's quota can be spent at once.
+    SPORTMONKS_BUDGET_PER_HOUR = float(os.getenv("SPORTMONKS_BUDGET_PER_HOUR", "3000"))
+    SPORTMONKS_BUDGET_BURST = float(os.getenv("SPORTMONKS_BUDGET_BURST", "300"))
+    # YouTube is in quota units: a search costs YOUTUBE_SEARCH_COST
+    YOUTUBE_BUDGET_PER_DAY = float(os.getenv("YOUTUBE_BUDGET_PER_DAY", "10000"))
+    YOUTUBE_BUDGET_BURST = float(os.getenv("YOUTUBE_BUDGET_BURST", "2500"))
+    YOUTUBE_SEARCH_COST = float(os.getenv("YOUTUBE_SEARCH_COST", "100"))
+    TWITTER_BUDGET_PER_DAY = float(os.getenv("TWITTER_BUDGET_PER_DAY", "1000"))
+    TWITTER_BUDGET_BURST = float(os.getenv("TWITTER_BUDGET_BURST", "100"))
+    CRICBUZZ_BUDGET_PER_DAY = float(os.getenv("CRICBUZZ_BUDGET_PER_DAY", "300"))
+    CRICBUZZ_BUDGET_BURST = float(os.getenv("CRICBUZZ_BUDGET_BURST", "30"))
+
+    # SportMonks resilience: extra attempts on 5xx/timeouts, breaker trip/reset,
+    # hedging after the op's p95 (never sooner than HEDGE_MIN_MS), per-attempt deadline on the live path
+    SPORTMONKS_RETRIES = int(os.getenv("SPORTMONKS_RETRIES", "2"))
+    SPORTMONKS_BREAKER_FAILURES = int(os.getenv("SPORTMONKS_BREAKER_FAILURES", "5"))
+    SPORTMONKS_BREAKER_RESET_SECONDS = float(os.getenv("SPORTMONKS_BREAKER_RESET_SECONDS", "30"))
+    SPORTMONKS_HEDGE_ENABLED = os.getenv("SPORTMONKS_HEDGE_ENABLED", "true").lower() == "true"
+    SPORTMONKS_HEDGE_MIN_MS = float(os.getenv("SPORTMONKS_HEDGE_MIN_MS", "300"))
+    SPORTMONKS_LIVE_ATTEMPT_TIMEOUT = float(os.getenv("SPORTMONKS_LIVE_ATTEMPT_TIMEOUT", "5"))
+    SPORTMONKS_DETAIL_ATTEMPT_TIMEOUT = float(os.getenv("SPORTMONKS_DETAIL_ATTEMPT_TIMEOUT", "15"))
+    # How old a stored live snapshot may get and still be served while SportMonks fails (seconds)
+    SPORTMONKS_LKG_TTL = int(os.getenv("SPORTMONKS_LKG_TTL", "3600"))
+
+    # Engagement ingestion: '|'-separated queries, run concurrently, each paged until its high-water mark
+    TWITTER_QUERIES = os.getenv("TWITTER_QUERIES", "#MajorLeagueCricket|#USACricket|#BigBashLeague|#T20Cricket")
+    YOUTUBE_QUERIES = os.getenv("YOUTUBE_QUERIES", "Major League Cricket highlights|USA cricket")
+    # Tweets per search page; larger pages are parsed incrementally (see engagement_normalizer)
+    TWITTER_SEARCH_COUNT = int(os.getenv("TWITTER_SEARCH_COUNT", "20"))
+    ENGAGEMENT_MAX_PAGES = int(os.getenv("ENGAGEMENT_MAX_PAGES", "5"))
+    ENGAGEMENT_QUERY_CONCURRENCY = int(os.getenv("ENGAGEMENT_QUERY_CONCURRENCY", "4"))
+    # Posts per INSERT ... ON CONFLICT statement
+    ENGAGEMENT_WRITE_BATCH_SIZE = int(os.getenv("ENGAGEMENT_WRITE_BATCH_SIZE", "200"))
+    # Optional JSON file {"blacklist": [...], "context": [...]} overriding the built-in
+    # content filter vocabularies; re-read when it changes (checked every N seconds)
+    CONTENT_FILTER_PATH = os.getenv("CONTENT_FILTER_PATH", "")
+    CONTENT_FILTER_RELOAD_SECONDS = float(os.getenv("CONTENT_FILTER_RELOAD_SECONDS", "30"))
+
+    # Shared upstream HTTP pool
+    HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
 settings = Settings()
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+from typing import Dict, Any
+
+# Simple in-process metrics registry (per worker).
+# Exposed via GET /metrics so we can eyeball latency wins without extra infra.
+
+_counters: Dict[str, int] = defaultdict(int)
+_gauges: Dict[str, Any] = {}
+_timings: Dict[str, deque] = defaultdict(lambda: deque(maxlen=200))
+_histograms: Dict[str, Dict[str, int]] = {}
+
+# Upper bounds (ms) for histogram buckets
+HISTOGRAM_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+def incr(name: str, value: int = 1):
+    _counters[name] += value
+
+
+def set_gauge(name: str, value: Any):
+    _gauges[name] = value
+
+
+def record_timing(name: str, seconds: float):
+    _timings[name].append(seconds)
+
+
+def observe(name: str, seconds: float):
+    """
+    Counts a sample into fixed latency buckets (per-bucket, not cumulative).
+    """
+    buckets = _histograms.setdefault(name, {})
+    ms = seconds * 1000
+    label = next((f"<={b}ms" for b in HISTOGRAM_BUCKETS_MS if ms <= b), f">{HISTOGRAM_BUCKETS_MS[-1]}ms")
+    buckets[label] = buckets.get(label, 0) + 1
+
+
+class timer:
+    """
+    Context manager that records elapsed wall time under `name`.
+    """
+    def __init__(self, name: str):
+        self.name = name
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._start
+        record_timing(self.name, self.elapsed)
+        return False
+
+
+def _summarize(samples: deque) -> dict:
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "last_ms": round(samples[-1] * 1000, 2),
+        "p50_ms": round(ordered[n // 2] * 1000, 2),
+        "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def snapshot() -> dict:
+    return {
+        "counters": dict(_counters),
+        "gauges": dict(_gauges),
+        "timings": {name: _summarize(s) for name, s in _timings.items() if s},
+        "histograms": {name: dict(b) for name, b in _histograms.items()},
+    }
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """
+    Sleeps `interval` seconds in a loop and records how late each wake-up is.
+    Any lag here is time the event loop spent blocked on something else.
+    """
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag = max(0.0, time.perf_counter() - start - interval)
+        observe("event_loop.lag", lag)
+        record_timing("event_loop.lag", lag)
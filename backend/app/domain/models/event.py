@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from enum import Enum
 from datetime import datetime
 from typing import Optional
@@ -8,6 +8,7 @@ class EventType(str, Enum):
     FOUR = "FOUR"
     SIX = "SIX"
     RUNS = "RUNS"
+    EXTRA = "EXTRA"
     OVER_END = "OVER_END"
     INNINGS_CHANGE = "INNINGS_CHANGE"
     MATCH_END = "MATCH_END"
@@ -16,6 +17,6 @@ class MatchEvent(BaseModel):
     match_id: str | int
     event_type: EventType
     description: str
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
     inning: int
     over: float
\ No newline at end of file
@@ -23,5 +23,8 @@ class LiveMatch(BaseModel):
     
     #Derived from the latest runs object
     current_batting_team_id: Optional[int] = None
+
+    #Id of the newest delivery already turned into events (ball-by-ball engine)
+    last_ball_id: Optional[int] = None
     
     last_updated: datetime
\ No newline at end of file
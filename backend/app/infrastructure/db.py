@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
@@ -7,9 +9,25 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Dedicated threads for blocking DB work from background jobs,
+# so a slow commit never runs on the event loop.
+db_executor = ThreadPoolExecutor(
+    max_workers=settings.DB_EXECUTOR_WORKERS,
+    thread_name_prefix="db"
+)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def run_db(fn, *args):
+    """
+    Runs fn(db, *args) on the DB executor with its own session and returns the result.
+    """
+    def _job():
+        with SessionLocal() as db:
+            return fn(db, *args)
+    return await asyncio.get_running_loop().run_in_executor(db_executor, _job)
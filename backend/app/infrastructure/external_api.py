@@ -1,11 +1,76 @@
+import asyncio
+import logging
+import time
 import httpx
 from app.core.config import settings
+from app.infrastructure.rate_limiter import budgeted_get, Priority
+from app.infrastructure.resilience import (
+    CircuitBreaker, CircuitOpen, LatencyTracker, hedged, is_upstream_failure, retry_with_jitter
+)
 from datetime import datetime, timedelta
 
+logger = logging.getLogger(__name__)
+
 class SportMonksAPI:
     def __init__(self):
         self.base_url = settings.EXTERNAL_API_BASE_URL.rstrip("/")
         self.api_token = settings.EXTERNAL_API_KEY
+        self.breaker = CircuitBreaker(
+            "sportmonks",
+            failure_threshold=settings.SPORTMONKS_BREAKER_FAILURES,
+            reset_timeout=settings.SPORTMONKS_BREAKER_RESET_SECONDS,
+        )
+        self.latency = LatencyTracker()
+
+    async def _get_json(self, op: str, priority: Priority, url: str, params: dict, timeout: float,
+                        hedge: bool = False, deadline: float | None = None) -> dict:
+        """
+        GET with jittered retries, a circuit breaker and (optionally) a hedged second
+        request once the attempt outlives this op's p95. `timeout` bounds each attempt.
+        `deadline` (time.monotonic()) bounds the whole call: attempts are shortened and
+        retries dropped to fit, so running out of time is a timeout the breaker counts,
+        not a cancellation from the caller's wait_for.
+        Failures always raise: serving stale data is the caller's call (the live poller
+        keeps its stored snapshots), never something passed off here as a fresh answer.
+        """
+        async def attempt():
+            started = time.monotonic()
+            attempt_timeout = timeout if deadline is None else min(timeout, deadline - started)
+            if attempt_timeout <= 0:
+                raise asyncio.TimeoutError(f"SportMonks {op} deadline exceeded")
+            response = await asyncio.wait_for(
+                budgeted_get("sportmonks", priority, url, params=params, timeout=attempt_timeout), attempt_timeout
+            )
+            response.raise_for_status()
+            self.latency.record(op, time.monotonic() - started)
+            return response.json()
+
+        async def hedged_attempt():
+            hedge_after = None
+            if hedge and settings.SPORTMONKS_HEDGE_ENABLED:
+                p95 = self.latency.p95(op)
+                if p95 is not None:
+                    hedge_after = max(p95, settings.SPORTMONKS_HEDGE_MIN_MS / 1000)
+            return await hedged(attempt, hedge_after)
+
+        if not self.breaker.allow():
+            raise CircuitOpen(f"SportMonks circuit open, skipping {op}")
+        try:
+            data = await retry_with_jitter(hedged_attempt, settings.SPORTMONKS_RETRIES, deadline=deadline)
+        except Exception as e:
+            if is_upstream_failure(e):
+                self.breaker.record_failure()
+            elif isinstance(e, httpx.HTTPStatusError):
+                # A 4xx is an answer: upstream is up
+                self.breaker.record_success()
+            raise
+        finally:
+            # However the call ended (incl. cancellation), never keep the probe slot;
+            # record_success/record_failure still decide the state
+            self.breaker.release_probe()
+
+        self.breaker.record_success()
+        return data
 
     async def fetch_live_matches_raw(self) -> dict:
         """
@@ -13,12 +78,14 @@ class SportMonksAPI:
         Returns raw JSON from SportMonks API.
         """
         url = f"{self.base_url}/livescores"
-        params = {"api_token": self.api_token, "include": "localteam,visitorteam"}
+        # 'runs' lets the poller normalize straight from this list payload,
+        # 'balls' feeds the ball-by-ball event engine
+        params = {"api_token": self.api_token, "include": "localteam,visitorteam,runs,balls"}
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            "livescores", Priority.LIVE, url, params, settings.SPORTMONKS_LIVE_ATTEMPT_TIMEOUT,
+            hedge=True
+        )
 
     async def fetch_todays_matches_raw(self) -> dict:
         """
@@ -29,26 +96,26 @@ class SportMonksAPI:
         params = {"api_token": self.api_token,
                    "include": "localteam,visitorteam,runs"}
 
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            "livescores_today", Priority.LIVE, url, params, settings.SPORTMONKS_LIVE_ATTEMPT_TIMEOUT,
+            hedge=True
+        )
         
-    async def fetch_match_by_id_raw(self, match_id: str) -> dict:
+    async def fetch_match_by_id_raw(self, match_id: str, deadline: float | None = None) -> dict:
         url = f"{self.base_url}/fixtures/{match_id}"
         params = {
             "api_token": self.api_token,
-            "include": "localteam,visitorteam,runs,venue"
+            "include": "localteam,visitorteam,runs,venue,balls"
         }
-        async with httpx.AsyncClient(timeout=10) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            "fixture", Priority.LIVE, url, params, settings.SPORTMONKS_LIVE_ATTEMPT_TIMEOUT,
+            hedge=True, deadline=deadline
+        )
 
-    async def fetch_fixtures_raw(self) -> dict:
+    async def fetch_fixtures_raw(self, start_date=None, end_date=None, page: int | None = None) -> dict:
             today = datetime.now().date()
-            start_date = today - timedelta(days=30)
-            end_date = today + timedelta(days=30)
+            start_date = start_date or today - timedelta(days=30)
+            end_date = end_date or today + timedelta(days=30)
             
             date_range = f"{start_date},{end_date}"
 
@@ -59,26 +126,27 @@ class SportMonksAPI:
                 "sort": "starting_at",
                 "filter[starts_between]": date_range,
             }
+            if page:
+                params["page"] = page
             
-            async with httpx.AsyncClient(timeout=15) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
-    
-    async def fetch_match_details_rich(self, match_id: str) -> dict:
+            return await self._get_json("fixtures", Priority.DETAIL, url, params, 15)
+
+    async def fetch_fixtures_window(self, start_date, end_date) -> list:
         """
-        Fetches FULL match details using the allowed includes for your plan.
+        Fetches every fixture in [start_date, end_date], following pagination if present.
         """
-        url = f"{self.base_url}/fixtures/{match_id}"
-        params = {
-            "api_token": self.api_token,
-            "include": "localteam,visitorteam,venue,runs,batting,bowling,lineup,tosswon,firstumpire,secondumpire,tvumpire,referee,manofmatch",
-        }
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
-        
+        fixtures = []
+        page = 1
+        while True:
+            payload = await self.fetch_fixtures_raw(start_date, end_date, page=page)
+            fixtures.extend(payload.get("data", []))
+
+            pagination = payload.get("meta", {}).get("pagination") or {}
+            total_pages = pagination.get("total_pages") or pagination.get("last_page") or 1
+            if page >= total_pages:
+                return fixtures
+            page += 1
+
     async def fetch_match_details_rich(self, match_id: str) -> dict:
         """
         Updated to include balls and wickets for rich scorecard.
@@ -89,10 +157,9 @@ class SportMonksAPI:
             "api_token": self.api_token,
             "include": "localteam,visitorteam,venue,runs,batting,bowling,lineup,tosswon,balls,scoreboards",
         }
-        async with httpx.AsyncClient(timeout=15) as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._get_json(
+            "fixture_rich", Priority.DETAIL, url, params, settings.SPORTMONKS_DETAIL_ATTEMPT_TIMEOUT
+        )
 
 class NewsAPI:
     def __init__(self):
@@ -108,14 +175,13 @@ class NewsAPI:
         """
         url = f"https://{self.host}/news/v1/index"
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(url, headers=self.headers)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                logger.error(f"News API fetch failed: {e}")
-                return {}
+        try:
+            response = await budgeted_get("cricbuzz", Priority.ENGAGEMENT, url, headers=self.headers, timeout=30.0)
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.error(f"News API fetch failed: {e}")
+            return {}
 
 sportmonks_api = SportMonksAPI()
-news_api = NewsAPI()
\ No newline at end of file
+news_api = NewsAPI()
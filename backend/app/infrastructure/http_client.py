@@ -0,0 +1,80 @@
+import httpx
+import logging
+from urllib.parse import urlsplit
+from app.core.config import settings
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class HttpClientPool:
+    """
+    App-wide pool of keep-alive httpx clients, one per upstream host, so
+    connection limits apply per host and TLS sessions are reused across calls.
+    Opened on startup / closed on shutdown in main.py; clients are also created
+    lazily so scripts and serverless invocations work without the lifespan hooks.
+    """
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build_client(self) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=limits,
+            timeout=httpx.Timeout(15.0, connect=10.0),
+            event_hooks={"request": [self._attach_trace], "response": [self._count_request]},
+        )
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        host = urlsplit(url).netloc or url
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            self._clients[host] = client
+        return client
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.client_for(url).get(url, **kwargs)
+
+    async def open(self):
+        logger.info(f"HTTP client pool ready (http2={HTTP2_AVAILABLE})")
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    # --- Connection reuse accounting ---
+    # httpcore reports a connect_tcp event only when it has to open a new
+    # socket, so every request without one rode on a pooled connection.
+    async def _attach_trace(self, request: httpx.Request):
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, info: dict):
+        if event_name == "connection.connect_tcp.complete":
+            metrics.incr("http.connections_new")
+
+    async def _count_request(self, response: httpx.Response):
+        metrics.incr("http.requests")
+
+
+def connection_stats() -> dict:
+    counters = metrics.snapshot()["counters"]
+    requests = counters.get("http.requests", 0)
+    new = counters.get("http.connections_new", 0)
+    return {"requests": requests, "new_connections": new, "reused": max(0, requests - new)}
+
+
+http_pool = HttpClientPool()
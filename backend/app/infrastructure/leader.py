@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable
+
+from app.core.config import settings
+from app.core import metrics
+from app.infrastructure.redis_async import redis_async
+from app.infrastructure.single_flight import release_lock
+
+logger = logging.getLogger(__name__)
+
+# Unique per process, so two uvicorn workers on one host never share a lock
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+# Extend the lock only if we still own it
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+async def run_as_leader(name: str, job: Callable[[], Awaitable[None]]):
+    """
+    Runs the long-lived coroutine `job()` only while this worker holds the Redis
+    lock leader:{name}. Every other worker waits as a standby and takes over if the
+    leader dies or stops renewing within LEADER_LOCK_TTL seconds.
+    """
+    key = f"leader:{name}"
+    ttl = settings.LEADER_LOCK_TTL
+    while True:
+        try:
+            acquired = await redis_async.set(key, WORKER_ID, nx=True, px=int(ttl * 1000))
+        except Exception as e:
+            logger.error(f"Leader election for {name} failed: {e}")
+            acquired = False
+
+        if not acquired:
+            await asyncio.sleep(ttl / 3)
+            continue
+
+        logger.info(f"Worker {WORKER_ID} is now leader for '{name}'")
+        metrics.set_gauge(f"leader.{name}", WORKER_ID)
+        task = asyncio.create_task(job())
+        try:
+            while not task.done():
+                await asyncio.sleep(ttl / 3)
+                renewed = await redis_async.eval(_RENEW_SCRIPT, 1, key, WORKER_ID, int(ttl * 1000))
+                if not renewed:
+                    logger.warning(f"Worker {WORKER_ID} lost leadership for '{name}'")
+                    break
+        except Exception as e:
+            logger.error(f"Leader renewal for {name} failed: {e}")
+        finally:
+            task.cancel()
+            metrics.set_gauge(f"leader.{name}", None)
+            await release_lock(key, WORKER_ID)
@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+
+import httpx
+
+from app.core.config import settings
+from app.core import metrics
+from app.infrastructure.http_client import http_pool
+from app.infrastructure.redis_async import redis_async
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    LIVE = 0
+    DETAIL = 1
+    HIGHLIGHTS = 2
+    ENGAGEMENT = 3
+
+
+# Share of a bucket each class must leave untouched: engagement can never spend
+# the last half, so live scores still have quota when peak hours arrive
+RESERVE_FRACTION = {
+    Priority.LIVE: 0.0,
+    Priority.DETAIL: 0.1,
+    Priority.HIGHLIGHTS: 0.3,
+    Priority.ENGAGEMENT: 0.5,
+}
+
+# How long a caller may wait for tokens before giving up (seconds)
+MAX_WAIT = {
+    Priority.LIVE: 2.0,
+    Priority.DETAIL: 1.0,
+    Priority.HIGHLIGHTS: 0.0,
+    Priority.ENGAGEMENT: 0.0,
+}
+
+
+@dataclass(frozen=True)
+class Budget:
+    per_second: float   # refill rate, in quota units
+    capacity: float     # burst size, in quota units
+
+
+BUDGETS = {
+    "sportmonks": Budget(settings.SPORTMONKS_BUDGET_PER_HOUR / 3600, settings.SPORTMONKS_BUDGET_BURST),
+    "youtube": Budget(settings.YOUTUBE_BUDGET_PER_DAY / 86400, settings.YOUTUBE_BUDGET_BURST),
+    "twitter": Budget(settings.TWITTER_BUDGET_PER_DAY / 86400, settings.TWITTER_BUDGET_BURST),
+    "cricbuzz": Budget(settings.CRICBUZZ_BUDGET_PER_DAY / 86400, settings.CRICBUZZ_BUDGET_BURST),
+}
+
+# Refill + take in one atomic step, on Redis' clock so workers agree.
+# KEYS: bucket hash, blocked-until key. ARGV: rate per ms, capacity, cost, reserve.
+# Returns {allowed, wait_ms}.
+_TAKE_SCRIPT = """
+local blocked = redis.call('pttl', KEYS[2])
+if blocked > 0 then return {0, blocked} end
+
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local reserve = tonumber(ARGV[4])
+local t = redis.call('time')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed, wait = 0, 0
+if tokens - cost >= reserve then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = math.ceil((cost + reserve - tokens) / rate)
+end
+redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('pexpire', KEYS[1], math.ceil(capacity / rate) * 2)
+return {allowed, wait}
+"""
+
+
+class BudgetExceeded(Exception):
+    def __init__(self, provider: str, priority: Priority, retry_after: float):
+        super().__init__(f"{provider} budget exhausted for {priority.name} (retry in {retry_after:.0f}s)")
+        self.provider = provider
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+async def acquire(provider: str, priority: Priority, cost: float = 1):
+    """
+    Takes `cost` units from the provider's shared bucket, waiting up to
+    MAX_WAIT[priority]. Raises BudgetExceeded otherwise. Fails open if Redis is down.
+    """
+    budget = BUDGETS[provider]
+    reserve = budget.capacity * RESERVE_FRACTION[priority]
+    deadline = time.monotonic() + MAX_WAIT[priority]
+    while True:
+        try:
+            allowed, wait_ms = await redis_async.eval(
+                _TAKE_SCRIPT, 2, f"budget:{provider}", f"budget:{provider}:blocked",
+                budget.per_second / 1000, budget.capacity, cost, reserve,
+            )
+        except Exception as e:
+            logger.warning(f"Budget check for {provider} unavailable, allowing call: {e}")
+            return
+
+        if allowed:
+            metrics.incr(f"budget.{provider}.granted")
+            return
+        wait = wait_ms / 1000
+        if time.monotonic() + wait > deadline:
+            metrics.incr(f"budget.{provider}.denied.{priority.name.lower()}")
+            raise BudgetExceeded(provider, priority, wait)
+        await asyncio.sleep(wait)
+
+
+def parse_retry_after(value: str | None, default: float = 60.0) -> float:
+    """
+    Retry-After is either delta-seconds or an HTTP date.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+async def block_provider(provider: str, seconds: float):
+    """
+    Stops every worker from calling `provider` for `seconds` (after a 429).
+    """
+    await redis_async.set(f"budget:{provider}:blocked", "1", px=max(1, int(seconds * 1000)))
+
+
+async def budgeted_get(provider: str, priority: Priority, url: str, cost: float = 1, **kwargs) -> httpx.Response:
+    """
+    http_pool.get behind the provider's budget. A 429 (or 503 with Retry-After)
+    pauses the provider for all workers; the response is returned for the caller
+    to raise_for_status() as before.
+    """
+    await acquire(provider, priority, cost)
+    response = await http_pool.get(url, **kwargs)
+    retry_after = response.headers.get("retry-after")
+    if response.status_code == 429 or (response.status_code == 503 and retry_after):
+        seconds = parse_retry_after(retry_after)
+        logger.warning(f"{provider} throttled us ({response.status_code}); pausing {seconds:.0f}s")
+        metrics.incr(f"budget.{provider}.throttled")
+        try:
+            await block_provider(provider, seconds)
+        except Exception as e:
+            logger.warning(f"Could not record {provider} throttle: {e}")
+    return response
+
+
+async def budget_status() -> dict:
+    """
+    Tokens left per provider (as of each bucket's last update) and any active 429 pause.
+    """
+    status = {}
+    for provider, budget in BUDGETS.items():
+        try:
+            tokens = await redis_async.hget(f"budget:{provider}", "tokens")
+            blocked_ms = await redis_async.pttl(f"budget:{provider}:blocked")
+        except Exception:
+            continue
+        status[provider] = {
+            "tokens": round(float(tokens), 1) if tokens is not None else budget.capacity,
+            "capacity": budget.capacity,
+            "blocked_for_s": round(blocked_ms / 1000, 1) if blocked_ms and blocked_ms > 0 else 0,
+        }
+    return status
@@ -0,0 +1,84 @@
+from typing import List
+import redis.asyncio as aioredis
+
+from app.core.serialization import dumps, loads
+from app.infrastructure.redis_client import REDIS_URL
+
+# Shared asyncio connection pool for every coroutine path (poller, async routes).
+# Sync routes that run in the threadpool keep using redis_client.
+pool = aioredis.ConnectionPool.from_url(REDIS_URL, decode_responses=True)
+redis_async = aioredis.Redis(connection_pool=pool)
+
+# Same server, raw bytes out: for values that may not be UTF-8 (binary live snapshots)
+bin_pool = aioredis.ConnectionPool.from_url(REDIS_URL, decode_responses=False)
+redis_async_bin = aioredis.Redis(connection_pool=bin_pool)
+
+
+async def set_json(key: str, value: dict, ttl: int = 60):
+    await redis_async.set(key, dumps(value), ex=ttl)
+
+
+async def get_json(key: str) -> dict | None:
+    data = await redis_async.get(key)
+    return loads(data) if data else None
+
+
+async def push_event(key: str, event: dict, ttl: int = 300):
+    batch = RedisBatch()
+    batch.push_events(key, [event], ttl=ttl)
+    await batch.execute()
+
+
+async def get_events(key: str) -> List[dict]:
+    raw_list = await redis_async.lrange(key, 0, -1)
+    return [loads(item) for item in raw_list]
+
+
+async def mget_json(keys: List[str]) -> List[dict | None]:
+    """
+    Reads many JSON values in one round-trip. Missing keys come back as None.
+    """
+    if not keys:
+        return []
+    return [loads(raw) if raw else None for raw in await redis_async.mget(keys)]
+
+
+async def mget_raw(keys: List[str]) -> List[bytes | None]:
+    """
+    MGET through the binary-safe client: values come back as undecoded bytes.
+    """
+    if not keys:
+        return []
+    return await redis_async_bin.mget(keys)
+
+
+class RedisBatch:
+    """
+    Queues writes into a single MULTI/EXEC pipeline so a whole batch costs one round-trip.
+    Mirrors set_json/push_event; nothing is sent until execute().
+    """
+    def __init__(self):
+        self.pipe = redis_async.pipeline(transaction=True)
+
+    def set(self, key: str, value: str, ttl: int = 60):
+        self.pipe.set(key, value, ex=ttl)
+
+    def set_json(self, key: str, value: dict, ttl: int = 60):
+        self.pipe.set(key, dumps(value), ex=ttl)
+
+    def push_events(self, key: str, events: List[dict], ttl: int = 300):
+        if not events:
+            return
+        self.pipe.lpush(key, *[dumps(e) for e in events])
+        self.pipe.ltrim(key, 0, 49)
+        self.pipe.expire(key, ttl)
+
+    async def execute(self):
+        return await self.pipe.execute()
+
+
+async def close():
+    await redis_async.aclose()
+    await redis_async_bin.aclose()
+    await pool.aclose()
+    await bin_pool.aclose()
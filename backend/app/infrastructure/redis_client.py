@@ -1,8 +1,9 @@
 import redis
-import json
 import os
 from typing import List
 
+from app.core.serialization import dumps, loads
+
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 redis_client = redis.from_url(
@@ -10,20 +11,31 @@ redis_client = redis.from_url(
     decode_responses=True
 )
 
+# Raw bytes out, for values that may not be UTF-8 (binary live snapshots)
+redis_client_bin = redis.from_url(REDIS_URL)
+
 
 def set_json(key: str, value: dict, ttl: int=60):
-    redis_client.set(key, json.dumps(value, default=str), ex=ttl)
+    redis_client.set(key, dumps(value), ex=ttl)
 
 
 def get_json(key: str) -> dict | None:
     data = redis_client.get(key)
-    return json.loads(data) if data else None
+    return loads(data) if data else None
 
 def push_event(key: str, event: dict, ttl: int = 300):
-    redis_client.lpush(key, json.dumps(event, default=str))
+    redis_client.lpush(key, dumps(event))
     redis_client.ltrim(key, 0, 49)
     redis_client.expire(key, ttl)
 
 def get_events(key: str) -> List[dict]:
     raw_list = redis_client.lrange(key, 0, -1)
-    return [json.loads(item) for item in raw_list]
+    return [loads(item) for item in raw_list]
+
+def mget_raw(keys: List[str]) -> List[bytes | None]:
+    """
+    MGET through the binary-safe client: values come back as undecoded bytes.
+    """
+    if not keys:
+        return []
+    return redis_client_bin.mget(keys)
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """
+    Failures that say the upstream is degraded (worth retrying / tripping a breaker).
+    4xx answers and our own budget refusals are not.
+    """
+    if isinstance(exc, (asyncio.TimeoutError, httpx.TransportError)):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive upstream failures;
+    open -> half-open after `reset_timeout` seconds, letting one probe through;
+    the probe's outcome closes or re-opens it. Per worker.
+    """
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def release_probe(self):
+        """
+        Frees the half-open probe slot when the probe ended without a verdict on
+        upstream health (budget refusal, cancellation); the next call probes again.
+        """
+        self._probing = False
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info(f"Circuit {self.name} closed")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        metrics.set_gauge(f"circuit.{self.name}", "closed")
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Circuit {self.name} opened after {self.failures} failures")
+                metrics.incr(f"circuit.{self.name}.opened")
+            self.opened_at = time.monotonic()
+            metrics.set_gauge(f"circuit.{self.name}", "open")
+
+
+class LatencyTracker:
+    """
+    Rolling latency samples per operation, for picking a hedge delay.
+    """
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: dict[str, deque] = {}
+        self.window = window
+
+    def record(self, op: str, seconds: float):
+        self._samples.setdefault(op, deque(maxlen=self.window)).append(seconds)
+
+    def p95(self, op: str) -> float | None:
+        samples = self._samples.get(op)
+        if not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def worst_case_seconds(attempt_timeout: float, retries: int, max_delay: float = 2.0,
+                       hedge_after: float | None = None) -> float:
+    """
+    Upper bound on the wall time of retry_with_jitter(hedged(attempt)) when every
+    attempt is capped at `attempt_timeout` (a hedge copy can finish that long after it starts).
+    """
+    per_attempt = attempt_timeout + (hedge_after or 0.0)
+    return (retries + 1) * per_attempt + retries * max_delay
+
+
+async def retry_with_jitter(
+    fn: Callable[[], Awaitable[Any]],
+    retries: int,
+    base_delay: float = 0.2,
+    max_delay: float = 2.0,
+    deadline: float | None = None,
+) -> Any:
+    """
+    Re-runs an idempotent call on upstream failures with full-jitter exponential backoff.
+    With a `deadline` (time.monotonic()), no retry starts that would sleep past it:
+    the last failure is raised instead, so callers see it rather than an outer timeout.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt == retries or not is_upstream_failure(e):
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+            if deadline is not None and time.monotonic() + delay >= deadline:
+                raise
+            metrics.incr("resilience.retries")
+            await asyncio.sleep(delay)
+
+
+async def hedged(fn: Callable[[], Awaitable[Any]], hedge_after: float | None) -> Any:
+    """
+    Starts fn(); if it hasn't finished after `hedge_after` seconds, starts a second
+    copy and returns whichever succeeds first (the other is cancelled).
+    """
+    first = asyncio.create_task(fn())
+    if hedge_after is None:
+        return await first
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done:
+        return first.result()
+
+    metrics.incr("resilience.hedged")
+    pending = {first, asyncio.create_task(fn())}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
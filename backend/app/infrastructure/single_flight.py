@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable
+
+from app.core import metrics
+from app.infrastructure.redis_async import redis_async
+
+logger = logging.getLogger(__name__)
+
+# Delete a lock only if it still holds our token: after our TTL lapsed a peer
+# may own it, and a plain DEL would release theirs. Shared by leader election.
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key: the first caller runs the
+    work, everyone else awaits the same task. Within one worker only; pair
+    with run_with_redis_lock() to coalesce across workers.
+    """
+    def __init__(self):
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    def is_running(self, key: str) -> bool:
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            metrics.incr("single_flight.coalesced")
+        # shield: a cancelled waiter must not cancel the shared fetch
+        return await asyncio.shield(task)
+
+
+async def acquire_lock(lock_key: str, ttl: int) -> str | None:
+    """
+    SET NX with a per-call token; returns the token, or None if a peer holds the lock.
+    """
+    token = uuid.uuid4().hex
+    if await redis_async.set(lock_key, token, nx=True, ex=ttl):
+        return token
+    return None
+
+
+async def release_lock(lock_key: str, token: str):
+    """
+    Compare-and-delete: releases lock_key only if it still holds `token`.
+    """
+    try:
+        await redis_async.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+    except Exception as e:
+        logger.warning(f"Could not release {lock_key}: {e}")
+
+
+async def run_with_redis_lock(
+    key: str,
+    fn: Callable[[], Awaitable[Any]],
+    wait_for_result: Callable[[], Awaitable[Any]],
+    lock_ttl: int = 15,
+    wait_timeout: float = 5.0,
+) -> Any:
+    """
+    Cross-worker single-flight. The worker that wins lock:{key} runs fn();
+    others poll wait_for_result() (e.g. a cache read) until the winner has
+    stored its result, and only run fn() themselves if that never happens.
+    lock_ttl should cover fn()'s worst case, or a peer can start a second run.
+    """
+    lock_key = f"lock:{key}"
+    try:
+        token = await acquire_lock(lock_key, lock_ttl)
+    except Exception as e:
+        logger.warning(f"Lock {lock_key} unavailable, fetching directly: {e}")
+        return await fn()
+
+    if token:
+        try:
+            return await fn()
+        finally:
+            await release_lock(lock_key, token)
+
+    metrics.incr("single_flight.waited_on_peer")
+    deadline = asyncio.get_running_loop().time() + wait_timeout
+    while asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.1)
+        result = await wait_for_result()
+        if result is not None:
+            return result
+    return await fn()
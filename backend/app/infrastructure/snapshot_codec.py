@@ -0,0 +1,136 @@
+import struct
+
+from app.core.config import settings
+from app.core.serialization import dumps, loads
+
+# Compact layout for live:match:{id} values (a LiveMatch dumped with mode='json').
+# A leading version byte tells it apart from JSON, which always starts with '{',
+# so readers handle both formats and the codec can be switched at any time.
+SNAPSHOT_VERSION = 2
+
+# version, match_id, flags, toss_won_team_id, current_batting_team_id, innings count
+_HEADER = struct.Struct(">BqBqqB")
+# v2: last_ball_id follows the header
+_LAST_BALL = struct.Struct(">q")
+# inning, team_id, score, wickets, overs
+_INNING = struct.Struct(">BqIBd")
+_STR_LEN = struct.Struct(">H")
+
+_FLAG_TOSS_WON = 1
+_FLAG_BATTING = 2
+_FLAG_ELECTED = 4
+_FLAG_LAST_BALL = 8
+
+_FIELDS = {
+    "match_id", "status", "note", "innings", "toss_won_team_id",
+    "toss_elected", "current_batting_team_id", "last_updated", "last_ball_id",
+}
+_INNING_FIELDS = {"inning", "team_id", "score", "wickets", "overs"}
+
+
+def _pack_str(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return _STR_LEN.pack(len(data)) + data
+
+
+def _unpack_str(buf: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _STR_LEN.unpack_from(buf, offset)
+    offset += _STR_LEN.size
+    return buf[offset:offset + length].decode("utf-8"), offset + length
+
+
+def pack_snapshot(data: dict) -> bytes:
+    """
+    Binary-encodes a snapshot. Raises ValueError/struct.error for anything the
+    fixed layout can't represent (unknown fields, out-of-range numbers).
+    """
+    if not set(data) <= _FIELDS or any(not set(i) <= _INNING_FIELDS for i in data.get("innings") or []):
+        raise ValueError("snapshot has fields outside the binary layout")
+
+    flags = 0
+    if data.get("toss_won_team_id") is not None:
+        flags |= _FLAG_TOSS_WON
+    if data.get("current_batting_team_id") is not None:
+        flags |= _FLAG_BATTING
+    if data.get("toss_elected") is not None:
+        flags |= _FLAG_ELECTED
+    if data.get("last_ball_id") is not None:
+        flags |= _FLAG_LAST_BALL
+
+    innings = data.get("innings") or []
+    parts = [_HEADER.pack(
+        SNAPSHOT_VERSION, data["match_id"], flags,
+        data.get("toss_won_team_id") or 0, data.get("current_batting_team_id") or 0, len(innings),
+    ), _LAST_BALL.pack(data.get("last_ball_id") or 0)]
+    for i in innings:
+        parts.append(_INNING.pack(i["inning"], i["team_id"], i["score"], i["wickets"], i["overs"]))
+    parts.append(_pack_str(data["status"]))
+    parts.append(_pack_str(data.get("note") or ""))
+    parts.append(_pack_str(data["last_updated"]))
+    if flags & _FLAG_ELECTED:
+        parts.append(_pack_str(data["toss_elected"]))
+    return b"".join(parts)
+
+
+def unpack_snapshot(buf: bytes) -> dict:
+    version, match_id, flags, toss_won, batting, n_innings = _HEADER.unpack_from(buf, 0)
+    if version not in (1, SNAPSHOT_VERSION):
+        raise ValueError(f"Unknown snapshot version {version}")
+    offset = _HEADER.size
+    last_ball_id = None
+    if version >= 2:
+        (last_ball_id,) = _LAST_BALL.unpack_from(buf, offset)
+        offset += _LAST_BALL.size
+
+    innings = []
+    for _ in range(n_innings):
+        inning, team_id, score, wickets, overs = _INNING.unpack_from(buf, offset)
+        offset += _INNING.size
+        innings.append({"inning": inning, "team_id": team_id, "score": score, "wickets": wickets, "overs": overs})
+
+    status, offset = _unpack_str(buf, offset)
+    note, offset = _unpack_str(buf, offset)
+    last_updated, offset = _unpack_str(buf, offset)
+    toss_elected = None
+    if flags & _FLAG_ELECTED:
+        toss_elected, offset = _unpack_str(buf, offset)
+
+    return {
+        "match_id": match_id,
+        "status": status,
+        "note": note,
+        "innings": innings,
+        "toss_won_team_id": toss_won if flags & _FLAG_TOSS_WON else None,
+        "toss_elected": toss_elected,
+        "current_batting_team_id": batting if flags & _FLAG_BATTING else None,
+        "last_updated": last_updated,
+        "last_ball_id": last_ball_id if flags & _FLAG_LAST_BALL else None,
+    }
+
+
+def encode_snapshot(data: dict, codec: str | None = None) -> bytes:
+    """
+    Encodes with LIVE_SNAPSHOT_CODEC ('json' | 'binary'); falls back to JSON
+    whenever the binary layout can't hold the snapshot.
+    """
+    if (codec or settings.LIVE_SNAPSHOT_CODEC) == "binary":
+        try:
+            return pack_snapshot(data)
+        except (ValueError, KeyError, TypeError, struct.error):
+            pass
+    return dumps(data)
+
+
+def decode_snapshot(raw: bytes | str) -> dict:
+    if isinstance(raw, str) or raw[:1] == b"{":
+        return loads(raw)
+    return unpack_snapshot(raw)
+
+
+def snapshot_json(raw: bytes) -> bytes:
+    """
+    JSON bytes for a stored snapshot: JSON values pass through untouched.
+    """
+    if raw[:1] == b"{":
+        return raw
+    return dumps(unpack_snapshot(raw))
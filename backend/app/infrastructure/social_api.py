@@ -3,6 +3,7 @@ import logging
 import urllib.parse
 from typing import Dict, Any
 from app.core.config import settings
+from app.infrastructure.rate_limiter import BudgetExceeded, budgeted_get, Priority
 
 logger = logging.getLogger(__name__)
 
@@ -10,25 +11,37 @@ class SocialAPI:
     def __init__(self):
         self.timeout = httpx.Timeout(30.0, connect=10.0)
 
-    async def fetch_twitter_search(self, query: str, count: int = 20) -> Dict[str, Any]:
+    async def fetch_twitter_search_raw(self, query: str, count: int = 20, cursor: str | None = None) -> bytes:
+        """
+        Undecoded response body, for callers that parse it incrementally.
+        Raises on failure: an empty page would read as the end of the timeline.
+        """
         base_url = f"https://{settings.TWITTER_HOST}/search-v3"
         encoded_query = urllib.parse.quote(query)
         full_url = f"{base_url}?type=Latest&count={count}&query={encoded_query}"
+        if cursor:
+            full_url += f"&cursor={urllib.parse.quote(cursor)}"
         
         headers = {
             "x-rapidapi-key": settings.RAPID_API_KEY,
             "x-rapidapi-host": settings.TWITTER_HOST
         }
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(full_url, headers=headers)
-                response.raise_for_status()
-                return response.json()
+            response = await budgeted_get("twitter", Priority.ENGAGEMENT, full_url, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response.content
         except Exception as e:
             logger.error(f"Twitter API fetch failed: {str(e)}")
-            return {}
+            raise
 
-    async def fetch_youtube_search(self, query: str, max_results: int = 10) -> Dict[str, Any]:
+    async def fetch_youtube_search(
+        self,
+        query: str,
+        max_results: int = 10,
+        priority: Priority = Priority.ENGAGEMENT,
+        page_token: str | None = None,
+        published_after: str | None = None,
+    ) -> Dict[str, Any]:
         url = "https://www.googleapis.com/youtube/v3/search"
         params = {
             "part": "snippet",
@@ -39,14 +52,23 @@ class SocialAPI:
             "regionCode": "US",
             "relevanceLanguage": "en"
         }
+        if page_token:
+            params["pageToken"] = page_token
+        if published_after:
+            # Incremental: newest first, nothing older than what we already have
+            params["publishedAfter"] = published_after
+            params["order"] = "date"
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                return response.json()
+            # search.list costs YOUTUBE_SEARCH_COST quota units, shared by highlights and the engagement poller
+            response = await budgeted_get("youtube", priority, url, cost=settings.YOUTUBE_SEARCH_COST, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+        except BudgetExceeded:
+            raise
         except Exception as e:
+            # Not an empty result: callers must not treat a failed search as "nothing found"
             logger.error(f"YouTube API fetch failed: {str(e)}")
-            return {}
+            raise
 
 social_api = SocialAPI()
\ No newline at end of file
@@ -0,0 +1,140 @@
+import time
+from collections import OrderedDict
+from typing import Any, List
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.serialization import dumps, loads
+from app.infrastructure.redis_async import redis_async, redis_async_bin
+
+# Key prefixes that can be invalidated as a group by bumping their version
+NAMESPACES = ("live:", "match:detail:", "engagement:feed:")
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Bounded in-memory LRU with per-entry expiry. Event-loop only (no locking).
+    """
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+
+    def get(self, key: str, version: int) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, entry_version, value = entry
+        if expires_at < time.monotonic() or entry_version != version:
+            del self._data[key]
+            return _MISSING
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float, version: int):
+        self._data[key] = (time.monotonic() + ttl, version, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class TieredCache:
+    """
+    L1 (in-process LRU, short TTL) in front of L2 (Redis).
+    Values handed out are shared between requests: treat them as read-only.
+    """
+    def __init__(self, max_entries: int, l1_ttl: float):
+        self.l1 = LRUCache(max_entries)
+        self.l1_ttl = l1_ttl
+        self._versions: dict[str, int] = {ns: 0 for ns in NAMESPACES}
+
+    def _version(self, key: str) -> int:
+        for ns in NAMESPACES:
+            if key.startswith(ns):
+                return self._versions[ns]
+        return 0
+
+    def invalidate(self, namespace: str):
+        """
+        Drops every L1 entry under `namespace` in O(1) by bumping its version.
+        """
+        self._versions[namespace] = self._versions.get(namespace, 0) + 1
+        metrics.incr(f"cache.invalidations.{namespace.rstrip(':')}")
+
+    def _l1_get(self, key: str) -> Any:
+        value = self.l1.get(key, self._version(key))
+        metrics.incr("cache.l1.miss" if value is _MISSING else "cache.l1.hit")
+        return value
+
+    def _l1_set(self, key: str, value: Any, ttl: float | None = None):
+        self.l1.set(key, value, min(self.l1_ttl, ttl or self.l1_ttl), self._version(key))
+        metrics.set_gauge("cache.l1.size", len(self.l1))
+
+    async def get_text(self, key: str) -> str | None:
+        value = self._l1_get(key)
+        if value is not _MISSING:
+            return value
+        value = await redis_async.get(key)
+        metrics.incr("cache.redis.miss" if value is None else "cache.redis.hit")
+        if value is not None:
+            self._l1_set(key, value)
+        return value
+
+    async def get_json(self, key: str) -> dict | None:
+        value = self._l1_get(key)
+        if value is not _MISSING:
+            return value
+        raw = await redis_async.get(key)
+        metrics.incr("cache.redis.miss" if raw is None else "cache.redis.hit")
+        if raw is None:
+            return None
+        value = loads(raw)
+        self._l1_set(key, value)
+        return value
+
+    async def mget_json(self, keys: List[str]) -> List[dict | None]:
+        """
+        L1 first; every L1 miss is fetched from Redis in a single MGET.
+        """
+        results = [self._l1_get(k) for k in keys]
+        missing = [i for i, v in enumerate(results) if v is _MISSING]
+        if missing:
+            raw_list = await redis_async.mget([keys[i] for i in missing])
+            for i, raw in zip(missing, raw_list):
+                metrics.incr("cache.redis.miss" if raw is None else "cache.redis.hit")
+                results[i] = loads(raw) if raw else None
+                if raw:
+                    self._l1_set(keys[i], results[i])
+        return results
+
+    async def mget_raw(self, keys: List[str]) -> List[bytes | None]:
+        """
+        Like mget_json but hands back the stored bytes undecoded, for routes that send
+        them verbatim. A key should be read either raw or as JSON, never both (they
+        share one L1 slot).
+        """
+        results = [self._l1_get(k) for k in keys]
+        missing = [i for i, v in enumerate(results) if v is _MISSING]
+        if missing:
+            raw_list = await redis_async_bin.mget([keys[i] for i in missing])
+            for i, raw in zip(missing, raw_list):
+                metrics.incr("cache.redis.miss" if raw is None else "cache.redis.hit")
+                results[i] = raw
+                if raw:
+                    self._l1_set(keys[i], raw)
+        return results
+
+    async def set_text(self, key: str, value: str, ttl: int = 60):
+        await redis_async.set(key, value, ex=ttl)
+        self._l1_set(key, value, ttl)
+
+    async def set_json(self, key: str, value: dict, ttl: int = 60):
+        await redis_async.set(key, dumps(value), ex=ttl)
+        self._l1_set(key, value, ttl)
+
+
+cache = TieredCache(settings.L1_CACHE_MAX_ENTRIES, settings.L1_CACHE_TTL)
@@ -1,12 +1,20 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core import logging
+from app.core import metrics
+from app.core.config import settings
 from app.api.routes import matches, schedules, waitlist, engagement, news
 from app.services.live_snapshot_service import poll_and_store_live_matches
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.http_client import http_pool, connection_stats
+from app.infrastructure import redis_async
+from app.infrastructure.db import db_executor
+from app.infrastructure.leader import run_as_leader
+from app.infrastructure.rate_limiter import budget_status
+from app.services.live_stream_service import relay_live_updates
 from app.services.schedule_service import sync_schedules_to_db
 from app.services.engagement_service import fetch_and_store_engagement
 from app.services.news_service import fetch_and_store_news
+from app.services.scheduler import scheduler, live_interval, engagement_interval, fixed_interval
 import os
 import asyncio
 import logging
@@ -31,6 +39,15 @@ app.add_middleware(
 def health():
     return {"status":"ok"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return {**metrics.snapshot(), "http": connection_stats(), "budgets": await budget_status()}
+
+@app.get("/scheduler")
+async def get_scheduler():
+    """Last run, interval and next run of every background job (whichever worker leads it)."""
+    return await scheduler.status()
+
 app.include_router(matches.router)
 app.include_router(schedules.router)
 app.include_router(waitlist.router)
@@ -39,72 +56,30 @@ app.include_router(news.router)
 
 @app.on_event("startup")
 async def startup_event():
-    #Live Poller (Background)
-    async def start_live_polling():
-        while True:
-            try:
-                await poll_and_store_live_matches()
-            except Exception as e:
-                logger.error(f"Live polling error: {e}")
-            await asyncio.sleep(30)
-
-    #Twitter Poller (every 90 mins)
-    async def start_twitter_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching Tweets...")
-                with SessionLocal() as db:
-                    await fetch_and_store_engagement(db, "twitter")
-            except Exception as e:
-                logger.error(f"Twitter polling error: {e}")
-            await asyncio.sleep(5400) # 90 minutes * 60s
-    
-    #YouTube Poller (Every 20 mins)
-    async def start_youtube_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching Videos...")
-                with SessionLocal() as db:
-                    await fetch_and_store_engagement(db, "youtube")
-            except Exception as e:
-                logger.error(f"YouTube polling error: {e}")
-            await asyncio.sleep(1200) # 20 minutes * 60s
-
-    #Schedule Sync (Background - NON-BLOCKING)
-    async def run_initial_sync():
-        logger.info("Starting background schedule sync...")
-        db = SessionLocal()
-        try:
-            await sync_schedules_to_db(db)
-            logger.info("Schedule sync completed successfully.")
-        except Exception as e:
-            logger.error(f"Startup schedule sync failed: {e}")
-        finally:
-            db.close()
+    await http_pool.open()
 
-    #News Polling(every 4 hours)
-    async def start_news_polling():
-        while True:
-            try:
-                logger.info("Scheduled Task: Fetching News...")
-                with SessionLocal() as db:
-                    await fetch_and_store_news(db)
-            except Exception as e:
-                logger.error(f"News polling error: {e}")
-            
-            # Sleep for 4 hours (14400 seconds)
-            await asyncio.sleep(14400)
+    #Each job picks its next run from state (live cadence, kickoff distance) plus jitter
+    #Base intervals are each job's normal cadence, used if its policy can't be evaluated;
+    #live falls back to the break cadence so a blip mid-match doesn't stall scores for the idle period
+    scheduler.register("live", poll_and_store_live_matches, live_interval, settings.LIVE_POLL_INTERVAL_BREAK)
+    scheduler.register("twitter", lambda: fetch_and_store_engagement("twitter"), engagement_interval(settings.TWITTER_POLL_MINUTES), settings.TWITTER_POLL_MINUTES * 60)
+    scheduler.register("youtube", lambda: fetch_and_store_engagement("youtube"), engagement_interval(settings.YOUTUBE_POLL_MINUTES), settings.YOUTUBE_POLL_MINUTES * 60)
+    scheduler.register("news", fetch_and_store_news, fixed_interval(settings.NEWS_POLL_MINUTES), settings.NEWS_POLL_MINUTES * 60)
+    #Schedule sync runs once at startup, then refreshes the hot band every SCHEDULE_HOT_SYNC_MINUTES
+    scheduler.register("schedule", sync_schedules_to_db, fixed_interval(settings.SCHEDULE_HOT_SYNC_MINUTES), settings.SCHEDULE_HOT_SYNC_MINUTES * 60)
 
     #We use create_task so startup finishes immediately
-    asyncio.create_task(start_live_polling())
-    asyncio.create_task(start_twitter_polling()) 
-    asyncio.create_task(start_youtube_polling())
-    asyncio.create_task(start_news_polling())
-    asyncio.create_task(run_initial_sync())
+    asyncio.create_task(metrics.monitor_event_loop_lag())
+    #Every worker relays live updates from Redis pub/sub to its own stream viewers
+    asyncio.create_task(relay_live_updates())
+    #Pollers run on exactly one worker at a time (Redis leader lock per job)
+    for job_name in ("live", "twitter", "youtube", "news", "schedule"):
+        asyncio.create_task(run_as_leader(job_name, lambda job_name=job_name: scheduler.run(job_name)))
     
     logger.info("Server startup complete. Background tasks initiated.")
 
-
-
-
-
+@app.on_event("shutdown")
+async def shutdown_event():
+    await http_pool.close()
+    await redis_async.close()
+    db_executor.shutdown(wait=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, JSON, Text
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Text, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from sqlalchemy.sql import func
@@ -35,5 +35,13 @@ class EngagementPost(Base):
     published_at = Column(DateTime(timezone=True), index=True) # When it was tweeted/uploaded
     fetched_at = Column(DateTime(timezone=True), default=func.now()) # When we saved it
 
+    #Time-decayed engagement rank, computed at ingest (see engagement_ranking)
+    score = Column(Float, nullable=False, default=0.0, server_default="0")
+
     #Composite unique constraint to prevent duplicate tweets/videos
-    #We will handle this logic in the Upsert service, but good to know the intent.
\ No newline at end of file
+    #Also the conflict target of the bulk upsert in engagement_service
+    __table_args__ = (
+        UniqueConstraint("source", "source_id", name="uq_engagement_posts_source_source_id"),
+        #Keyset pagination of the ranked feed (ORDER BY score DESC, id DESC)
+        Index("ix_engagement_posts_score_id", "score", "id"),
+    )
\ No newline at end of file
@@ -25,4 +25,6 @@ class Match(Base):
     # Stores "India won by 7 runs"
     result_note = Column(String, nullable=True)
     highlights_url = Column(String, nullable=True)
+    # SHA-1 of the synced fixture content; lets the bulk upsert skip unchanged rows
+    content_hash = Column(String, nullable=True)
     updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
\ No newline at end of file
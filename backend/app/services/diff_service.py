@@ -1,8 +1,21 @@
 from app.domain.models import LiveMatch, MatchEvent, EventType
 
+FINISHED_STATUSES = {"Finished"}
+
+def completed_overs(overs: float) -> int:
+    """
+    Completed overs from cricket notation (4.3 = 4 overs 3 balls; 3.6 = 4 overs).
+    Works on tenths so float noise like 3.9999 can't truncate an over away.
+    """
+    whole, balls = divmod(int(round(float(overs) * 10)), 10)
+    return whole + balls // 6
+
 def detect_changes(old: LiveMatch | None, new: LiveMatch) -> list[MatchEvent]:
+    """
+    Heuristic fallback: diffs two score snapshots when no ball feed is available.
+    """
     events = []
-    
+
     # Need existing old match and valid new innings to compare
     if not old or not new.innings:
         return []
@@ -10,7 +23,7 @@ def detect_changes(old: LiveMatch | None, new: LiveMatch) -> list[MatchEvent]:
     # 1. Identify the "Active" Inning (Last one in the list)
     new_innings_sorted = sorted(new.innings, key=lambda x: x.inning)
     new_active = new_innings_sorted[-1]
-    
+
     # 2. Find matching inning in old data
     old_innings_sorted = sorted(old.innings or [], key=lambda x: x.inning)
     old_active = next((i for i in old_innings_sorted if i.inning == new_active.inning), None)
@@ -49,18 +62,119 @@ def detect_changes(old: LiveMatch | None, new: LiveMatch) -> list[MatchEvent]:
                 inning=new_active.inning,
                 over=str(new_active.overs)
             ))
-    
-    # 5. Detect Over Change
+
+    # 5. Detect Over Change (one event per over completed since the last poll)
     try:
-        if int(float(new_active.overs)) > int(float(old_active.overs)):
+        for over_number in range(completed_overs(old_active.overs) + 1, completed_overs(new_active.overs) + 1):
             events.append(MatchEvent(
                 match_id=new.match_id,
                 event_type=EventType.OVER_END,
-                description=f"End of Over {int(float(old_active.overs)) + 1}",
+                description=f"End of Over {over_number}",
                 inning=new_active.inning,
                 over=str(new_active.overs)
             ))
     except (ValueError, TypeError):
         pass
 
-    return events
\ No newline at end of file
+    return events
+
+# --- Ball-by-ball engine ---
+
+def _inning_number(scoreboard) -> int:
+    # SportMonks scoreboards are "S1", "S2", ...
+    digits = "".join(ch for ch in str(scoreboard or "") if ch.isdigit())
+    return int(digits) if digits else 1
+
+def classify_ball(ball: dict) -> tuple[EventType, str, bool]:
+    """
+    Returns (event_type, description, is_legal_delivery) for one raw SportMonks ball.
+    """
+    score = ball.get("score")
+    if not isinstance(score, dict):
+        try:
+            score = {"runs": int(score or 0)}
+        except (TypeError, ValueError):
+            score = {}
+    name = score.get("name") or ball.get("score_name") or ""
+    runs = int(score.get("runs") or 0)
+    lowered = name.lower()
+    is_wide = "wide" in lowered
+    is_noball = bool(score.get("noball")) or "no ball" in lowered
+    # "bye" also matches "leg bye"
+    is_bye = bool(score.get("bye") or score.get("leg_bye")) or "bye" in lowered
+    is_extra = is_wide or is_noball or is_bye
+    legal = score.get("ball", not (is_wide or is_noball))
+
+    if score.get("is_wicket") or score.get("out") or "wicket" in lowered:
+        return EventType.WICKET, name or "WICKET!", legal
+    # Explicit flags mark runs off the bat (a no-ball can still be hit for six);
+    # a runs total of 4/6 only counts when nothing says it was extras
+    if score.get("six") or (runs == 6 and not is_extra):
+        return EventType.SIX, "SIX Runs!", legal
+    if score.get("four") or (runs == 4 and not is_extra):
+        return EventType.FOUR, "FOUR runs!", legal
+    if is_extra:
+        return EventType.EXTRA, name or "Extra", legal
+    return EventType.RUNS, f"{runs} run(s)" if runs else "Dot ball", legal
+
+def detect_ball_events(old: LiveMatch | None, new: LiveMatch, balls: list[dict]) -> tuple[list[MatchEvent], int | None]:
+    """
+    Emits exactly one event per delivery newer than old.last_ball_id, plus
+    OVER_END / INNINGS_CHANGE / MATCH_END markers, and returns the new high-water ball id.
+    On the first poll of a match (no high-water mark yet) history is skipped, not replayed.
+    """
+    last_ball_id = old.last_ball_id if old else None
+    ball_ids = [b["id"] for b in balls if b.get("id") is not None]
+    if last_ball_id is not None:
+        ball_ids.append(last_ball_id)
+    newest_id = max(ball_ids, default=None)
+
+    events = []
+    if last_ball_id is not None:
+        previous = next((b for b in balls if b.get("id") == last_ball_id), None)
+        previous_inning = _inning_number(previous.get("scoreboard")) if previous else None
+        new_balls = sorted((b for b in balls if b.get("id") is not None and b["id"] > last_ball_id), key=lambda b: b["id"])
+
+        for ball in new_balls:
+            inning = _inning_number(ball.get("scoreboard"))
+            over = float(ball.get("ball") or 0)
+            if previous_inning is not None and inning != previous_inning:
+                events.append(MatchEvent(
+                    match_id=new.match_id,
+                    event_type=EventType.INNINGS_CHANGE,
+                    description=f"Innings {inning} underway",
+                    inning=inning,
+                    over=over
+                ))
+            previous_inning = inning
+
+            event_type, description, legal = classify_ball(ball)
+            events.append(MatchEvent(
+                match_id=new.match_id,
+                event_type=event_type,
+                description=description,
+                inning=inning,
+                over=over
+            ))
+
+            # x.6 on a legal delivery closes the over
+            if legal and int(round(over * 10)) % 10 == 6:
+                events.append(MatchEvent(
+                    match_id=new.match_id,
+                    event_type=EventType.OVER_END,
+                    description=f"End of Over {completed_overs(over)}",
+                    inning=inning,
+                    over=over
+                ))
+
+    if old and new.status in FINISHED_STATUSES and old.status not in FINISHED_STATUSES:
+        final = sorted(new.innings, key=lambda x: x.inning)[-1] if new.innings else None
+        events.append(MatchEvent(
+            match_id=new.match_id,
+            event_type=EventType.MATCH_END,
+            description=new.note or "Match finished",
+            inning=final.inning if final else 1,
+            over=final.overs if final else 0.0
+        ))
+
+    return events, newest_id
@@ -0,0 +1,32 @@
+import math
+from datetime import datetime
+
+from app.domain.models.engagement import EngagementMetrics
+
+# Scores are stored per post at ingest, so changing these only affects posts
+# written afterwards; re-run the backfill in migration e5a8c3d1f274 to rescore.
+LIKE_WEIGHT = 1.0
+SHARE_WEIGHT = 2.0
+COMMENT_WEIGHT = 1.5
+VIEW_WEIGHT = 0.01
+# A post this much newer needs half the engagement to rank level
+HALF_LIFE_SECONDS = 12 * 3600
+
+
+def weighted_engagement(metrics: EngagementMetrics) -> float:
+    return (
+        LIKE_WEIGHT * (metrics.likes or 0)
+        + SHARE_WEIGHT * (metrics.shares or 0)
+        + COMMENT_WEIGHT * (metrics.comments or 0)
+        + VIEW_WEIGHT * (metrics.views or 0)
+    )
+
+
+def engagement_score(metrics: EngagementMetrics, published_at: datetime) -> float:
+    """
+    Time-decayed rank that never needs recomputing: log2(1 + engagement) plus the
+    post's age in half-lives since the epoch. Halving a post's weight every half-life
+    preserves order between posts, so sorting by this fixed value is the same as
+    sorting by decayed engagement at any moment.
+    """
+    return math.log2(1 + weighted_engagement(metrics)) + published_at.timestamp() / HALF_LIFE_SECONDS
@@ -1,67 +1,228 @@
+import asyncio
 import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterable, List
+from sqlalchemy import literal_column
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 from app.models.sql_engagement import EngagementPost
+from app.core.config import settings
+from app.core import metrics
+from app.core.serialization import dumps_str, loads
+from app.infrastructure.db import run_db
+from app.infrastructure.redis_async import redis_async
 from app.infrastructure.social_api import social_api
-from app.services.normalizers.engagement_normalizer import normalize_twitter_response, normalize_youtube_response
+from app.domain.models.engagement import EngagementPostDomain
+from app.services.engagement_ranking import engagement_score
+from app.services.normalizers.engagement_normalizer import (
+    TwitterTimeline, normalize_youtube_response
+)
 
 logger = logging.getLogger(__name__)
 
-async def fetch_and_store_engagement(db: Session, platform: str):
+ENGAGEMENT_CURSOR_KEY = "engagement:cursor:{platform}"
+# Per query, while paging stopped short of the high-water mark: where to carry on and
+# the newest post already stored, which becomes the mark once the gap is closed
+ENGAGEMENT_RESUME_KEY = "engagement:resume:{platform}"
+
+def _queries(platform: str) -> list[str]:
+    raw = settings.TWITTER_QUERIES if platform == "twitter" else settings.YOUTUBE_QUERIES
+    return [q.strip() for q in raw.split("|") if q.strip()]
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+# Pagers read at most ENGAGEMENT_MAX_PAGES pages starting at paging["cursor"], and set it
+# to the next page's cursor as each page is consumed (None once the feed has no more)
+
+async def _twitter_pages(query: str, since: datetime | None, paging: dict) -> AsyncIterator[Iterable[EngagementPostDomain]]:
+    for _ in range(settings.ENGAGEMENT_MAX_PAGES):
+        raw = await social_api.fetch_twitter_search_raw(
+            query, count=settings.TWITTER_SEARCH_COUNT, cursor=paging["cursor"]
+        )
+        # Parsed lazily while the caller consumes it; the cursor is known once it's exhausted
+        page = TwitterTimeline(raw)
+        yield page
+        if page.truncated:
+            # Its missing cursor doesn't mean the end of the timeline
+            raise ValueError(f"Truncated Twitter page for '{query}'")
+        paging["cursor"] = page.cursor
+        if not page.cursor:
+            return
+
+async def _youtube_pages(query: str, since: datetime | None, paging: dict) -> AsyncIterator[Iterable[EngagementPostDomain]]:
+    # publishedAfter makes YouTube do the cutoff; +1s because it is inclusive
+    published_after = None
+    if since:
+        published_after = (_as_utc(since) + timedelta(seconds=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    for _ in range(settings.ENGAGEMENT_MAX_PAGES):
+        raw_data = await social_api.fetch_youtube_search(
+            query, max_results=10, page_token=paging["cursor"], published_after=published_after
+        )
+        yield normalize_youtube_response(raw_data)
+        paging["cursor"] = raw_data.get("nextPageToken")
+        if not paging["cursor"]:
+            return
+
+async def ingest_query(
+    platform: str, query: str, since: datetime | None, cursor: str | None = None
+) -> tuple[int, int, datetime | None, bool, str | None]:
+    """
+    Pages one query newest-first (from `cursor` when resuming) and stops after the first
+    page that reaches `since` (the query's high-water mark); without one, reads a single
+    page. Each page's posts are written as soon as it is parsed (before the next page is
+    fetched), in batches of at most ENGAGEMENT_WRITE_BATCH_SIZE, so pages larger than
+    that start landing mid-parse.
+    Returns (posts fetched, posts new to the DB, newest published_at stored, reached_since,
+    resume cursor). Running out of ENGAGEMENT_MAX_PAGES first leaves reached_since False
+    and the cursor of the next page to read: the mark must not move past the unread gap.
+    A failed fetch or write raises, so the caller leaves the query's state where it was
+    (older posts would otherwise fall behind an advanced mark).
+    """
+    pages = _twitter_pages if platform == "twitter" else _youtube_pages
+    batch_size = max(1, settings.ENGAGEMENT_WRITE_BATCH_SIZE)
+    batch: list[EngagementPostDomain] = []
+    fetched = saved = 0
+    newest = None
+    reached_since = since is None
+    paging = {"cursor": cursor}
+
+    async def flush():
+        nonlocal saved, newest
+        saved += await run_db(store_engagement_posts, batch)
+        # Only committed posts move the high-water mark
+        batch_newest = max(batch, key=lambda p: _as_utc(p.published_at)).published_at
+        if newest is None or _as_utc(batch_newest) > _as_utc(newest):
+            newest = batch_newest
+
+    async for page in pages(query, since, paging):
+        for post in page:
+            if since is not None and _as_utc(post.published_at) <= _as_utc(since):
+                reached_since = True
+                continue
+            fetched += 1
+            batch.append(post)
+            if len(batch) >= batch_size:
+                await flush()
+                batch = []
+        if batch:
+            await flush()
+            batch = []
+        if reached_since:
+            break
+    else:
+        # The end of the feed reaches `since` too; the page cap doesn't
+        reached_since = paging["cursor"] is None
+
+    metrics.incr(f"engagement.{platform}.posts_fetched", fetched)
+    if not reached_since:
+        metrics.incr(f"engagement.{platform}.page_cap_hit")
+    return fetched, saved, newest, reached_since, None if reached_since else paging["cursor"]
+
+async def fetch_and_store_engagement(platform: str):
     """
     Main entry point for the scheduler.
     platform: 'twitter' or 'youtube'
+    Runs every configured query concurrently, each resuming from its own
+    high-water mark (newest published_at seen, kept in Redis) and writing
+    its posts as they stream in. A query that hit the page cap before its mark
+    keeps the old mark and carries on from its resume cursor next run.
     """
     logger.info(f"Starting engagement fetch for {platform}...")
-    
-    new_posts = []
-    
-    # 1. Fetch & Normalize
-    if platform == "twitter":
-        # Simplified Query to be compatible with RapidAPI wrapper
-        query = "#MajorLeagueCricket OR #USACricket OR #BigBashLeague OR #T20Cricket"
-        
-        raw_data = await social_api.fetch_twitter_search(query, count=20)
-        new_posts = normalize_twitter_response(raw_data)
-        
-    elif platform == "youtube":
-        # Search for US-relevant cricket content
-        query = "Major League Cricket highlights USA cricket"
-        raw_data = await social_api.fetch_youtube_search(query, max_results=10)
-        new_posts = normalize_youtube_response(raw_data)
-
-    if not new_posts:
+    queries = _queries(platform)
+    cursor_key = ENGAGEMENT_CURSOR_KEY.format(platform=platform)
+    resume_key = ENGAGEMENT_RESUME_KEY.format(platform=platform)
+    stored = await redis_async.hgetall(cursor_key)
+    resume = {query: loads(state) for query, state in (await redis_async.hgetall(resume_key)).items()}
+
+    semaphore = asyncio.Semaphore(max(1, settings.ENGAGEMENT_QUERY_CONCURRENCY))
+
+    async def run(query: str):
+        since = datetime.fromisoformat(stored[query]) if query in stored else None
+        async with semaphore:
+            return await ingest_query(platform, query, since, cursor=resume.get(query, {}).get("cursor"))
+
+    # Fetch, normalize & store (queries in parallel, pages in order)
+    results = await asyncio.gather(*(run(q) for q in queries), return_exceptions=True)
+
+    fetched_count = saved_count = 0
+    high_water: dict[str, str] = {}
+    unfinished: dict[str, str] = {}
+    finished: list[str] = []
+    for query, result in zip(queries, results):
+        if isinstance(result, Exception):
+            logger.error(f"{platform} query '{query}' failed: {result}")
+            continue
+        fetched, saved, newest, reached_since, resume_cursor = result
+        fetched_count += fetched
+        saved_count += saved
+        # A resumed run only reads the gap; the newest post came from the run that left it
+        carried = resume.get(query, {}).get("newest")
+        if carried and (newest is None or _as_utc(newest) < _as_utc(datetime.fromisoformat(carried))):
+            newest = datetime.fromisoformat(carried)
+        if reached_since:
+            if newest is not None:
+                high_water[query] = newest.isoformat()
+            if query in resume:
+                finished.append(query)
+        else:
+            unfinished[query] = dumps_str({
+                "cursor": resume_cursor, "newest": newest.isoformat() if newest else None
+            })
+
+    # Advance each query's high-water mark now that its posts (and any gap) are stored
+    if high_water:
+        await redis_async.hset(cursor_key, mapping=high_water)
+    if unfinished:
+        await redis_async.hset(resume_key, mapping=unfinished)
+    if finished:
+        await redis_async.hdel(resume_key, *finished)
+
+    if not fetched_count:
         logger.info(f"No new {platform} posts found.")
         return
+    logger.info(f"Saved {saved_count} new {platform} posts from {len(queries)} queries.")
 
-    # 2. Store in DB (Upsert)
-    saved_count = 0
+def store_engagement_posts(db: Session, new_posts: List[EngagementPostDomain]) -> int:
+    """
+    Bulk upserts normalized posts: one INSERT ... ON CONFLICT (source, source_id)
+    per ENGAGEMENT_WRITE_BATCH_SIZE posts. Existing posts only get fresh metrics,
+    score and fetched_at. Returns how many were new; re-raises after
+    rolling back a failed write. Blocking; run via run_db from async code.
+    """
+    # Dedupe: Postgres rejects a statement that touches the same row twice
+    rows = {}
     for post in new_posts:
-        post_data = post.model_dump(exclude={'id'}) 
-        
+        post_data = post.model_dump(exclude={'id'})
+
         # Convert Pydantic sub-models to dicts for JSON columns
         post_data['media'] = [m.model_dump() for m in post.media]
         post_data['author'] = post.author.model_dump()
         post_data['metrics'] = post.metrics.model_dump()
+        post_data['score'] = engagement_score(post.metrics, post.published_at)
+        post_data['id'] = str(uuid.uuid4())
+        rows[(post.source, post.source_id)] = post_data
+    # Sorted so concurrent query writers lock conflicting rows in the same order
+    rows = [rows[key] for key in sorted(rows)]
 
-        # Check if exists to avoid duplicates
-        exists = db.query(EngagementPost).filter(
-            EngagementPost.source == post.source,
-            EngagementPost.source_id == post.source_id
-        ).first()
-
-        if not exists:
-            db_obj = EngagementPost(**post_data)
-            db.add(db_obj)
-            saved_count += 1
-        else:
-            # Update metrics for existing posts
-            exists.metrics = post_data['metrics']
-            exists.fetched_at = post_data['fetched_at']
-
+    saved_count = 0
+    batch_size = max(1, settings.ENGAGEMENT_WRITE_BATCH_SIZE)
     try:
+        for start in range(0, len(rows), batch_size):
+            stmt = insert(EngagementPost).values(rows[start:start + batch_size])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EngagementPost.source, EngagementPost.source_id],
+                set_={
+                    "metrics": stmt.excluded.metrics,
+                    "score": stmt.excluded.score,
+                    "fetched_at": stmt.excluded.fetched_at,
+                }
+            ).returning(literal_column("(xmax = 0)").label("inserted"))
+            saved_count += sum(1 for r in db.execute(stmt).all() if r.inserted)
         db.commit()
-        logger.info(f"Saved {saved_count} new {platform} posts.")
     except Exception as e:
         logger.error(f"Database commit failed: {e}")
-        db.rollback()
\ No newline at end of file
+        db.rollback()
+        raise
+    return saved_count
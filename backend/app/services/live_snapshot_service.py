@@ -1,80 +1,248 @@
 from app.services.polling_service import get_raw_live_matches, get_raw_live_match
-from app.services.normalizers.match_normalizer import normalize_live_match
-from app.services.diff_service import detect_changes
-from app.infrastructure.redis_client import set_json, get_json, push_event, redis_client
+from app.services.normalizers.match_normalizer import normalize_live_match, is_complete_live_entry
+from app.services.diff_service import detect_changes, detect_ball_events
+from app.services.live_stream_service import publish_live_updates, snapshot_delta
+from app.services.score_service import materialize_livescore_view
+from app.infrastructure.redis_async import mget_raw, RedisBatch, redis_async
+from app.infrastructure.snapshot_codec import encode_snapshot, decode_snapshot
 from app.domain.models import LiveMatch
+from app.core.config import settings
+from app.core import metrics
 
-from app.infrastructure.db import SessionLocal
+from app.infrastructure.db import run_db
 from app.models.sql_match import Match
+from sqlalchemy.orm import Session
 
+import asyncio
 import logging
+import time
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-async def poll_and_store_live_matches():
-    raw_wrapper = await get_raw_live_matches()
+# Slack for the outer wait_for beyond the deadline handed to the API client, which
+# fits its retries inside it; the wait_for is only a backstop and shouldn't win the race
+_DEADLINE_GRACE_SECONDS = 1.0
+
+async def _fetch_detail(match_id: str, semaphore: asyncio.Semaphore) -> dict:
+    async with semaphore:
+        deadline = time.monotonic() + settings.LIVE_POLL_REQUEST_TIMEOUT
+        return await asyncio.wait_for(
+            get_raw_live_match(match_id, deadline=deadline),
+            timeout=settings.LIVE_POLL_REQUEST_TIMEOUT + _DEADLINE_GRACE_SECONDS
+        )
+
+def _within_lkg_window(snapshot: dict | None, now: datetime) -> bool:
+    """
+    True while a stored snapshot is recent enough to keep serving as last-known-good.
+    """
+    if not snapshot:
+        return False
+    try:
+        age = now - datetime.fromisoformat(str(snapshot["last_updated"]))
+    except (KeyError, ValueError):
+        return False
+    return age.total_seconds() <= settings.SPORTMONKS_LKG_TTL
+
+async def _hold_last_known_good():
+    """
+    Livescores failed: keep listing the matches whose stored snapshots are still within
+    SPORTMONKS_LKG_TTL. The snapshots themselves are left untouched, so their
+    last_updated shows viewers how stale they are.
+    """
+    try:
+        live_ids = await redis_async.get("live:matches")
+        if not live_ids:
+            return
+        match_ids = live_ids.split(",")
+        raw_snapshots = await mget_raw([f"live:match:{mid}" for mid in match_ids])
+        now = datetime.now()
+        held_ids = [
+            mid for mid, raw in zip(match_ids, raw_snapshots)
+            if raw and _within_lkg_window(decode_snapshot(raw), now)
+        ]
+        if held_ids:
+            await redis_async.set("live:matches", ",".join(held_ids), ex=60)
+            metrics.incr("live_poll.lkg_held", len(held_ids))
+        else:
+            await redis_async.delete("live:matches")
+    except Exception as e:
+        logger.warning(f"Could not hold last-known-good live matches: {e}")
+
+async def fetch_live_details(match_ids: list[str]) -> dict[str, dict]:
+    """
+    Fetches fixture details for all live matches concurrently.
+    At most LIVE_POLL_CONCURRENCY requests are in flight; a match that fails
+    or misses its deadline is dropped from this cycle instead of failing the poll.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.LIVE_POLL_CONCURRENCY))
+    results = await asyncio.gather(
+        *(_fetch_detail(mid, semaphore) for mid in match_ids),
+        return_exceptions=True
+    )
+
+    details = {}
+    for match_id, result in zip(match_ids, results):
+        if isinstance(result, asyncio.TimeoutError):
+            logger.warning(f"Detail fetch timed out for match {match_id}")
+            metrics.incr("live_poll.detail_timeouts")
+        elif isinstance(result, Exception):
+            logger.error(f"Detail fetch failed for match {match_id}: {result}")
+            metrics.incr("live_poll.detail_errors")
+        else:
+            details[match_id] = result
+    return details
+
+async def poll_and_store_live_matches() -> dict[str, str]:
+    """
+    One poll cycle. Returns {match_id: status} for the matches seen live,
+    which the scheduler uses to pick the next interval.
+    """
+    with metrics.timer("live_poll.total") as total_timer:
+        live_statuses = await _poll_and_store_live_matches()
+    metrics.set_gauge("live_poll.last_cycle", {
+        "mode": settings.LIVE_POLL_MODE,
+        "matches": len(live_statuses),
+        "total_ms": round(total_timer.elapsed * 1000, 2),
+    })
+
+    # Refresh the precomputed /livescore payload (no-op write if nothing changed)
+    try:
+        await run_db(materialize_livescore_view)
+    except Exception as e:
+        logger.exception(f"Livescore view refresh failed: {str(e)}")
+    return live_statuses
+
+async def _poll_and_store_live_matches() -> dict[str, str]:
+    try:
+        raw_wrapper = await get_raw_live_matches()
+    except Exception:
+        await _hold_last_known_good()
+        raise
     if not raw_wrapper or "data" not in raw_wrapper:
         logger.warning("No live match data received")
-        redis_client.delete("live:matches")
-        return
-    
-    matches = raw_wrapper.get("data", [])    
-    live_match_ids = []
-
-    with SessionLocal() as db:
-        for match_meta in matches:
-            match_id = match_meta.get("id")
-            if not match_id:
-                continue
-                
-            try:
-                # --- A. Fetch Full Details (for Scorecard/Innings) ---
-                raw_detail = await get_raw_live_match(str(match_id))
-                
-                # Check if detail fetch actually got data (SportMonks wrapper inside 'data' key)
-                if "data" in raw_detail:
-                    raw_detail = raw_detail["data"]
-                
-                # --- B. Normalize ---
-                new_match: LiveMatch = normalize_live_match(raw_detail)
-                live_match_ids.append(str(match_id))
-                
-                # --- C. Redis Logic (Diffing) ---
-                redis_key = f"live:match:{match_id}"
-                old_data = get_json(redis_key)
-                old_match = LiveMatch(**old_data) if old_data else None
-
-                events = detect_changes(old_match, new_match)
-                
-                if events:
-                    event_key = f"match:events:{match_id}"
-                    for event in events:
-                        push_event(event_key, event.model_dump(mode='json'))
-                    # logger.info(f"Pushed {len(events)} events for {match_id}")
-
-                # Save to Redis (TTL 24 hours to keep finished match results available for a while)
-                set_json(redis_key, new_match.model_dump(mode='json'), ttl=86400)
-                
-                # --- D. SQL Status Sync (The Fix) ---
-                # We check the DB to see if the status needs updating (e.g., NS -> LIVE)
-                sql_match = db.query(Match).filter(Match.match_id == str(match_id)).first()
-                
-                if sql_match:
-                    # Only update if status implies a state change (ignore minor string differences if needed)
-                    # For now, we update if strings are not equal
-                    if sql_match.status != new_match.status:
-                        logger.info(f"SYNC SQL: Match {match_id} status {sql_match.status} -> {new_match.status}")
-                        sql_match.status = new_match.status
-                        # If the match just finished, we might want to trigger a full update, 
-                        # but for now, just updating status is enough for the List View.
-                        db.commit()
-
-            except Exception as e:
-                logger.exception(f"Error processing match {match_id}: {str(e)}")
-                continue
-    
-
-    if live_match_ids:
-        redis_client.set("live:matches", ",".join(live_match_ids), ex=60)
-    
-    logger.info(f"Polled {len(live_match_ids)} matches. SQL Sync complete.")
\ No newline at end of file
+        await redis_async.delete("live:matches")
+        return {}
+
+    matches = raw_wrapper.get("data", [])
+    match_ids = [str(m["id"]) for m in matches if m.get("id")]
+
+    # --- A. Single-shot: use list entries that already carry runs/status/toss ---
+    details = {}
+    if settings.LIVE_POLL_MODE == "single_shot":
+        details = {str(m["id"]): m for m in matches if is_complete_live_entry(m)}
+
+    # --- A2. Fetch Full Details (for incomplete entries only), fanned out ---
+    missing_ids = [mid for mid in match_ids if mid not in details]
+    if missing_ids:
+        with metrics.timer("live_poll.fetch_details"):
+            details.update(await fetch_live_details(missing_ids))
+    metrics.incr("live_poll.upstream_calls", 1 + len(missing_ids))
+
+    # --- B. Normalize ---
+    new_matches: dict[str, LiveMatch] = {}
+    ball_feeds: dict[str, list] = {}
+    for match_id in match_ids:
+        raw_detail = details.get(match_id)
+        if raw_detail is None:
+            continue
+        try:
+            # Check if detail fetch actually got data (SportMonks wrapper inside 'data' key)
+            if "data" in raw_detail:
+                raw_detail = raw_detail["data"]
+            new_matches[match_id] = normalize_live_match(raw_detail)
+            if isinstance(raw_detail.get("balls"), list):
+                ball_feeds[match_id] = raw_detail["balls"]
+        except Exception as e:
+            logger.exception(f"Error normalizing match {match_id}: {str(e)}")
+
+    # --- C. Redis Logic (Diffing): one MGET for every previous snapshot ---
+    raw_snapshots = await mget_raw([f"live:match:{mid}" for mid in match_ids])
+    old_snapshots = {mid: decode_snapshot(raw) if raw else None for mid, raw in zip(match_ids, raw_snapshots)}
+
+    # A match whose detail fetch failed stays listed on its stored snapshot (not rewritten,
+    # so last_updated keeps its age) until that is older than SPORTMONKS_LKG_TTL
+    now = datetime.now()
+    held_ids = [
+        mid for mid in match_ids
+        if mid not in new_matches and _within_lkg_window(old_snapshots[mid], now)
+    ]
+    if held_ids:
+        metrics.incr("live_poll.lkg_held", len(held_ids))
+
+    live_match_ids = [mid for mid in match_ids if mid in new_matches or mid in held_ids]
+    if not live_match_ids:
+        logger.info(f"Polled 0/{len(match_ids)} matches.")
+        return {}
+
+    batch = RedisBatch()
+    stream_updates = []
+    for match_id in new_matches:
+        old_data = old_snapshots[match_id]
+        new_match = new_matches[match_id]
+        try:
+            old_match = LiveMatch(**old_data) if old_data else None
+            if match_id in ball_feeds:
+                # One event per new delivery; only balls past the stored high-water id are read
+                match_events, new_match.last_ball_id = detect_ball_events(old_match, new_match, ball_feeds[match_id])
+            else:
+                match_events = detect_changes(old_match, new_match)
+                new_match.last_ball_id = old_match.last_ball_id if old_match else None
+            events = [e.model_dump(mode='json') for e in match_events]
+            batch.push_events(f"match:events:{match_id}", events)
+            stream_updates.extend({"type": "event", "match_id": match_id, "data": e} for e in events)
+            metrics.incr("live_poll.events", len(events))
+        except Exception as e:
+            logger.exception(f"Error diffing match {match_id}: {str(e)}")
+        new_data = new_match.model_dump(mode='json')
+
+        delta = snapshot_delta(old_data, new_data)
+        if delta:
+            stream_updates.append({"type": "delta", "match_id": match_id, "data": delta})
+
+        # Save to Redis (TTL 24 hours to keep finished match results available for a while)
+        batch.set(f"live:match:{match_id}", encode_snapshot(new_data), ttl=86400)
+
+    batch.set("live:matches", ",".join(live_match_ids), ttl=60)
+
+    # --- D. Flush snapshots, events, trims and expiries in one round-trip ---
+    with metrics.timer("live_poll.redis_flush"):
+        await batch.execute()
+
+    # Push deltas + events to streaming viewers (SSE / WebSocket) on every worker
+    try:
+        await publish_live_updates(stream_updates, live_match_ids)
+    except Exception as e:
+        logger.error(f"Publishing live updates failed: {e}")
+
+    # --- E. SQL Status Sync (The Fix), on the DB executor ---
+    live_statuses = {mid: m.status for mid, m in new_matches.items()}
+    try:
+        await run_db(sync_match_statuses, live_statuses)
+    except Exception as e:
+        logger.exception(f"SQL status sync failed: {str(e)}")
+    # Held matches still count as live for the scheduler's cadence
+    live_statuses.update((mid, old_snapshots[mid]["status"]) for mid in held_ids)
+
+    logger.info(f"Polled {len(new_matches)}/{len(match_ids)} matches ({len(held_ids)} held). SQL Sync complete.")
+    return live_statuses
+
+def sync_match_statuses(db: Session, statuses: dict[str, str]):
+    """
+    Copies live statuses onto SQL rows. Blocking; run via run_db from async code.
+    """
+    # We check the DB to see if the status needs updating (e.g., NS -> LIVE)
+    sql_matches = db.query(Match).filter(Match.match_id.in_(list(statuses.keys()))).all()
+    changed = False
+    for sql_match in sql_matches:
+        new_status = statuses[sql_match.match_id]
+        # Only update if status implies a state change (ignore minor string differences if needed)
+        # For now, we update if strings are not equal
+        if sql_match.status != new_status:
+            logger.info(f"SYNC SQL: Match {sql_match.match_id} status {sql_match.status} -> {new_status}")
+            sql_match.status = new_status
+            changed = True
+    # If the match just finished, we might want to trigger a full update,
+    # but for now, just updating status is enough for the List View.
+    if changed:
+        db.commit()
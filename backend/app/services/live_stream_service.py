@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Optional
+
+from app.core import metrics
+from app.core.serialization import dumps, loads
+from app.infrastructure.redis_async import mget_raw, redis_async
+from app.infrastructure.snapshot_codec import decode_snapshot
+from app.infrastructure.tiered_cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Redis pub/sub channel carrying each poll cycle's output to every worker
+LIVE_UPDATES_CHANNEL = "live:updates"
+
+# Fields that change every poll without carrying information for viewers
+IGNORED_DELTA_FIELDS = {"last_updated", "last_ball_id"}
+
+
+def snapshot_delta(old: dict | None, new: dict) -> dict:
+    """
+    Returns the top-level LiveMatch fields that changed between two snapshots.
+    A missing old snapshot yields the full new snapshot.
+    """
+    if not old:
+        return dict(new)
+    return {
+        k: v for k, v in new.items()
+        if k not in IGNORED_DELTA_FIELDS and old.get(k) != v
+    }
+
+
+class Subscription:
+    """
+    One connected viewer. `match_ids=None` means every live match.
+    """
+    def __init__(self, match_ids: Optional[set[str]] = None, max_queue: int = 100):
+        self.match_ids = match_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def wants(self, match_id: str) -> bool:
+        return self.match_ids is None or match_id in self.match_ids
+
+    def offer(self, message: dict):
+        # Slow consumer: drop the oldest message rather than block the poller
+        if self.queue.full():
+            self.queue.get_nowait()
+            metrics.incr("live_stream.dropped")
+        self.queue.put_nowait(message)
+
+
+class LiveBroadcaster:
+    """
+    In-process fan-out of poller output to SSE/WebSocket viewers.
+    One upstream poll feeds every connection; viewers never touch Postgres.
+    """
+    def __init__(self):
+        self._subscribers: set[Subscription] = set()
+        # Full snapshots only; a match missing here is read from Redis on demand
+        self._latest: dict[str, dict] = {}
+        self._live_ids: Optional[set[str]] = None
+
+    def subscribe(self, match_ids: Optional[set[str]] = None) -> Subscription:
+        sub = Subscription(match_ids)
+        self._subscribers.add(sub)
+        metrics.set_gauge("live_stream.subscribers", len(self._subscribers))
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._subscribers.discard(sub)
+        metrics.set_gauge("live_stream.subscribers", len(self._subscribers))
+
+    def publish(self, messages: list[dict], live_ids: Optional[list[str]] = None):
+        """
+        messages: [{"type": "delta" | "event", "match_id": str, "data": dict}, ...]
+        live_ids: current live set; cached snapshots for other matches are dropped.
+        """
+        if live_ids is not None:
+            self._live_ids = set(live_ids)
+            self._latest = {mid: snap for mid, snap in self._latest.items() if mid in self._live_ids}
+        for message in messages:
+            if message["type"] == "delta":
+                mid, data = message["match_id"], message["data"]
+                if mid in self._latest:
+                    self._latest[mid].update(data)
+                elif "match_id" in data:
+                    # match_id never changes, so only a delta against no previous snapshot carries it
+                    self._latest[mid] = dict(data)
+            for sub in self._subscribers:
+                if sub.wants(message["match_id"]):
+                    sub.offer(message)
+
+    async def initial_snapshots(self, match_ids: Optional[set[str]] = None) -> list[dict]:
+        """
+        Full snapshots sent on connect, from memory; matches this worker only has
+        deltas for (or a cold worker's whole live set) come from one Redis MGET.
+        """
+        live_ids = self._live_ids
+        if live_ids is None:
+            ids = await redis_async.get("live:matches")
+            live_ids = set(ids.split(",")) if ids else set()
+        wanted = live_ids if match_ids is None else live_ids & set(match_ids)
+
+        missing = [mid for mid in wanted if mid not in self._latest]
+        if missing:
+            for mid, raw in zip(missing, await mget_raw([f"live:match:{m}" for m in missing])):
+                if raw:
+                    self._latest[mid] = decode_snapshot(raw)
+        return [
+            {"type": "snapshot", "match_id": mid, "data": self._latest[mid]}
+            for mid in wanted if mid in self._latest
+        ]
+
+
+live_broadcaster = LiveBroadcaster()
+
+
+async def publish_live_updates(messages: list[dict], live_ids: list[str]):
+    """
+    Broadcasts one poll cycle to every worker (including this one) via Redis pub/sub.
+    """
+    payload = dumps({"messages": messages, "live_ids": live_ids})
+    await redis_async.publish(LIVE_UPDATES_CHANNEL, payload)
+
+
+async def relay_live_updates():
+    """
+    Runs in every worker: feeds pub/sub cycles into the in-process broadcaster,
+    so followers serve streams without running the poller themselves.
+    """
+    while True:
+        pubsub = redis_async.pubsub()
+        try:
+            await pubsub.subscribe(LIVE_UPDATES_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                cycle = loads(message["data"])
+                # New snapshots were just written: drop this worker's L1 copies
+                cache.invalidate("live:")
+                live_broadcaster.publish(cycle["messages"], live_ids=cycle["live_ids"])
+                metrics.incr("live_stream.cycles_relayed")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Live update relay error: {e}")
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
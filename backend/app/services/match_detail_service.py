@@ -0,0 +1,252 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from dateutil import parser # Ensure python-dateutil is installed
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core import metrics
+from app.models.sql_match import Match
+from app.infrastructure.db import run_db
+from app.infrastructure.external_api import sportmonks_api
+from app.infrastructure.social_api import social_api
+from app.infrastructure.rate_limiter import BudgetExceeded, Priority
+from app.infrastructure.redis_async import get_json as redis_get_json
+from app.infrastructure.tiered_cache import cache
+from app.infrastructure.resilience import worst_case_seconds
+from app.infrastructure.single_flight import SingleFlight, acquire_lock, release_lock, run_with_redis_lock
+from app.services.normalizers.detail_normalizer import normalize_match_detail
+
+logger = logging.getLogger("uvicorn.error")
+
+detail_flight = SingleFlight()
+
+# The cross-worker refresh lock must outlive the slowest fetch (every retry timing out),
+# plus headroom for the DB read and cache write, or a second worker fetches in parallel
+DETAIL_LOCK_TTL = int(worst_case_seconds(
+    settings.SPORTMONKS_DETAIL_ATTEMPT_TIMEOUT, settings.SPORTMONKS_RETRIES
+)) + 10
+
+# Strong refs for fire-and-forget tasks (the loop only keeps weak ones)
+_background_tasks: set[asyncio.Task] = set()
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def save_highlights_url(db: Session, match_id: int, url: str):
+    match_row = db.query(Match).filter(Match.id == match_id).first()
+    if match_row:
+        match_row.highlights_url = url
+        db.commit()
+        logger.info(f"SAVED TO DB: Match {match_id}")
+
+async def fetch_and_store_highlights(match_id: int, team1: str, team2: str, match_start_str: str):
+    query = f"{team1} vs {team2} highlights"
+    logger.info(f"SEARCHING YOUTUBE: {query}")
+    
+    try:
+        if match_start_str:
+            match_date = parser.parse(match_start_str).replace(tzinfo=None)
+        else:
+            match_date = datetime.now()
+
+        results = await social_api.fetch_youtube_search(query, max_results=10, priority=Priority.HIGHLIGHTS)
+        items = results.get("items", [])
+        
+        valid_url = None
+        t1_lower = team1.lower().replace(" cricket", "")
+        t2_lower = team2.lower().replace(" cricket", "")
+
+        for item in items:
+            snippet = item.get("snippet", {})
+            title = snippet.get("title", "").lower()
+            
+            if "highlight" not in title:
+                continue
+
+            if t1_lower not in title or t2_lower not in title:
+                continue
+
+            upload_date_str = snippet.get("publishedAt") 
+            if upload_date_str:
+                upload_date = parser.parse(upload_date_str).replace(tzinfo=None)
+                diff = (upload_date - match_date).days
+                
+                if -2 <= diff <= 3:
+                    video_id = item["id"]["videoId"]
+                    valid_url = f"https://www.youtube.com/watch?v={video_id}"
+                    logger.info(f"MATCH FOUND: {title} ({valid_url})")
+                    break
+                else:
+                    logger.warning(f"Date Mismatch: {title} (Diff: {diff} days)")
+
+        if valid_url:
+            await run_db(save_highlights_url, match_id, valid_url)
+        else:
+            logger.error(f"No valid highlights found for {query}")
+        return valid_url
+
+    except BudgetExceeded:
+        raise
+    except Exception as e:
+        logger.error(f"Background Task Failed: {e}")
+        return None
+
+def load_match_row(db: Session, match_id: str) -> tuple[int, str | None] | None:
+    row = db.query(Match.id, Match.highlights_url).filter(Match.match_id == match_id).first()
+    return (row.id, row.highlights_url) if row else None
+
+def highlights_retry_delay(attempts: int) -> float:
+    """
+    Negative-cache backoff after `attempts` failed searches: base, 2x base, 4x base ... capped.
+    """
+    base = settings.HIGHLIGHTS_RETRY_BASE_SECONDS
+    return min(base * 2 ** max(attempts - 1, 0), settings.HIGHLIGHTS_RETRY_MAX_SECONDS)
+
+def highlights_search_due(payload: dict, state: dict | None, now: float) -> bool:
+    if payload.get("status") != "Finished" or payload.get("highlights_url"):
+        return False
+    if not state:
+        return True
+    return not state.get("url") and state.get("next_retry", 0) <= now
+
+async def build_match_detail(match_id: str) -> tuple[dict, int, dict | None]:
+    """
+    Fetches + normalizes one match detail.
+    Returns (payload, fresh_ttl_seconds, highlights_query). The query carries what a
+    later YouTube search needs, so it never has to re-fetch the fixture.
+    """
+    # Fetch Fresh Data
+    raw = await sportmonks_api.fetch_match_details_rich(match_id)
+    
+    # Normalize
+    normalized = normalize_match_detail(raw)
+    
+    # Enhance with DB Data
+    db_match = await run_db(load_match_row, match_id)
+    highlights_query = None
+    
+    if db_match:
+        db_id, highlights_url = db_match
+        normalized.highlights_url = highlights_url
+        
+        if normalized.status == "Finished" and not highlights_url:
+            data_part = raw.get("data", raw) # Handle wrapper
+            t1_name = data_part.get("localteam", {}).get("name")
+            t2_name = data_part.get("visitorteam", {}).get("name")
+            start_str = data_part.get("starting_at")
+            
+            if t1_name and t2_name:
+                highlights_query = {"db_id": db_id, "team1": t1_name, "team2": t2_name, "starting_at": start_str}
+            else:
+                logger.warning(f"Could not extract team names for match {match_id}")
+
+    response_data = normalized.dict()
+
+    # A finished scorecard never changes; highlights are tracked separately
+    is_live = raw.get("data", {}).get("live", False)
+    if is_live:
+        ttl = 60
+    elif normalized.status == "Finished":
+        ttl = settings.MATCH_DETAIL_FINISHED_TTL
+    else:
+        ttl = 86400
+
+    return response_data, ttl, highlights_query
+
+async def _search_highlights(match_id: str, query: dict):
+    """
+    One YouTube search per match across all workers, recorded in highlights:{match_id}
+    as {"url", "attempts", "next_retry"} so misses back off exponentially.
+    """
+    state_key = f"highlights:{match_id}"
+    lock_key = f"lock:{state_key}"
+    token = await acquire_lock(lock_key, 120)
+    if not token:
+        return
+    try:
+        state = await redis_get_json(state_key) or {"url": None, "attempts": 0, "next_retry": 0}
+        now = time.time()
+        if state.get("url") or state.get("next_retry", 0) > now:
+            return # A peer searched while we were waiting for the lock
+
+        try:
+            url = await fetch_and_store_highlights(query["db_id"], query["team1"], query["team2"], query["starting_at"])
+        except BudgetExceeded as e:
+            # Nothing was searched: keep attempts/next_retry so quota pressure doesn't grow the backoff
+            logger.info(f"Highlights search for {match_id} deferred: {e}")
+            metrics.incr("highlights.deferred_by_budget")
+            return
+        attempts = state.get("attempts", 0) + 1
+        if url:
+            state = {"url": url, "attempts": attempts, "next_retry": None}
+        else:
+            state = {"url": None, "attempts": attempts, "next_retry": now + highlights_retry_delay(attempts)}
+            metrics.incr("highlights.negative_cached")
+        await cache.set_json(state_key, state, ttl=settings.MATCH_DETAIL_FINISHED_TTL)
+    finally:
+        await release_lock(lock_key, token)
+
+def _is_fresh(entry: dict | None) -> bool:
+    return bool(entry) and entry["fresh_until"] > time.time()
+
+async def _refresh(match_id: str) -> dict:
+    """
+    Fetches fresh detail once across all workers and stores it as a cache envelope.
+    Redis keeps the entry MATCH_DETAIL_STALE_SECONDS past freshness for stale-while-revalidate.
+    """
+    cache_key = f"match:detail:{match_id}"
+
+    async def fetch_and_store():
+        payload, ttl, highlights_query = await build_match_detail(match_id)
+        entry = {"payload": payload, "fresh_until": time.time() + ttl, "highlights_query": highlights_query}
+        await cache.set_json(cache_key, entry, ttl=ttl + settings.MATCH_DETAIL_STALE_SECONDS)
+        metrics.incr("match_detail.upstream_fetches")
+        return entry
+
+    async def peer_result():
+        # Bypass L1: we want what the peer just wrote to Redis
+        entry = await redis_get_json(cache_key)
+        return entry if entry and entry["fresh_until"] > time.time() else None
+
+    return await run_with_redis_lock(cache_key, fetch_and_store, peer_result, lock_ttl=DETAIL_LOCK_TTL)
+
+async def _swallow(coro):
+    try:
+        await coro
+    except Exception as e:
+        logger.error(f"Background detail refresh failed: {e}")
+
+async def get_match_detail_cached(match_id: str) -> dict:
+    """
+    Cache-first match detail with single-flight misses and stale-while-revalidate:
+    fresh -> served; stale -> served now, one background refresh; missing -> one
+    upstream fetch shared by every concurrent request. Highlights are overlaid from
+    their own cache entry, so a finished match costs no upstream calls per view.
+    """
+    cache_key = f"match:detail:{match_id}"
+    state_key = f"highlights:{match_id}"
+    entry, highlights = await cache.mget_json([cache_key, state_key])
+    if entry is not None and "fresh_until" not in entry:
+        entry = None # Pre-envelope cache format: treat as a miss
+
+    if entry is None:
+        entry = await detail_flight.do(cache_key, lambda: _refresh(match_id))
+    elif not _is_fresh(entry):
+        metrics.incr("match_detail.stale_served")
+        if not detail_flight.is_running(cache_key):
+            _spawn(_swallow(detail_flight.do(cache_key, lambda: _refresh(match_id))))
+
+    payload = entry["payload"]
+    if highlights and highlights.get("url") and not payload.get("highlights_url"):
+        # Cached values are shared: copy before overlaying
+        payload = {**payload, "highlights_url": highlights["url"]}
+
+    query = entry.get("highlights_query")
+    if query and highlights_search_due(payload, highlights, time.time()) and not detail_flight.is_running(state_key):
+        _spawn(_swallow(detail_flight.do(state_key, lambda: _search_highlights(match_id, query))))
+
+    return payload
@@ -4,6 +4,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
 
+from app.infrastructure.db import run_db
 from app.infrastructure.external_api import news_api
 from app.models.sql_news import NewsArticle
 
@@ -19,7 +20,7 @@ def generate_cricbuzz_url(story_id: int, headline: str) -> str:
     
     return f"https://www.cricbuzz.com/cricket-news/{story_id}"
 
-async def fetch_and_store_news(db: Session):
+async def fetch_and_store_news():
     logger.info("Starting News Fetch...")
     
     raw_data = await news_api.fetch_top_stories()
@@ -29,6 +30,13 @@ async def fetch_and_store_news(db: Session):
         logger.info("No news stories found.")
         return
 
+    # Store in DB (off the event loop)
+    await run_db(store_news_stories, story_list)
+
+def store_news_stories(db: Session, story_list: list):
+    """
+    Upserts Cricbuzz stories. Blocking; run via run_db from async code.
+    """
     saved_count = 0
     
     for item in story_list:
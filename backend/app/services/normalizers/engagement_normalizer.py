@@ -1,7 +1,14 @@
 import re
+import io
+import json
 import logging
+import os
+import time
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
+
+# Streams large timeline pages without building the whole dict tree
+import ijson
 
 from app.domain.models.engagement import (
     EngagementPostDomain, 
@@ -9,6 +16,7 @@ from app.domain.models.engagement import (
     EngagementMedia, 
     EngagementMetrics
 )
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -28,126 +36,297 @@ CRICKET_CONTEXT_WORDS = {
     "teamusa", "americancricket", "mlc2025", "ipl", "bbl15", "bbl2025"
 }
 
-def is_valid_content(text: str) -> bool:
-    if not text:
-        return False
-    text_lower = text.lower()
-    
-    # 1. Blacklist Check
-    if any(word in text_lower for word in BLACKLIST_KEYWORDS):
-        return False
-        
-    # 2. Context Check
-    tokens = set(re.split(r'\W+', text_lower))
-    if tokens.intersection(CRICKET_CONTEXT_WORDS):
-        return True
-
-    return False
-
-def normalize_twitter_response(raw_data: Dict[str, Any]) -> List[EngagementPostDomain]:
+_WORD_RE = re.compile(r"\w+")
+
+def _trie_pattern(words) -> str:
     """
-    Parses Twitter241 (RapidAPI) JSON into domain models.
+    Regex for a set of literal words, factored by common prefix
+    ("ball", "bat" -> "ba(?:ll|t)"), so matching cost tracks text length
+    rather than the number of keywords.
     """
-    posts = []
-    
-    # LOGGING START
-    if not raw_data:
-        logger.error("❌ Normalizer received EMPTY raw_data")
-        return []
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        ends_here = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if ends_here:
+            # Shorter keyword is a prefix of a longer one; either completes a match
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+class ContentFilter:
+    """
+    Blacklist + cricket-context check, built once per vocabulary.
+    Same rules as before: a blacklist keyword anywhere in the text rejects it;
+    otherwise some whole word (split on non-word chars) must be a context word.
+    The blacklist is one prefix-trie regex (one scan of the text); the context
+    check looks each token up in a set.
+    """
+    def __init__(self, blacklist: set[str], context: set[str]):
+        self.blacklist = frozenset(w.lower() for w in blacklist if w)
+        self.context = frozenset(w.lower() for w in context if w)
+        self._blacklist_re = re.compile(_trie_pattern(self.blacklist)) if self.blacklist else None
+
+    def is_valid(self, text: str) -> bool:
+        if not text:
+            return False
+        text_lower = text.lower()
+
+        # 1. Blacklist Check
+        if self._blacklist_re and self._blacklist_re.search(text_lower):
+            return False
+
+        # 2. Context Check
+        context = self.context
+        return any(word in context for word in _WORD_RE.findall(text_lower))
 
+
+_content_filter = ContentFilter(BLACKLIST_KEYWORDS, CRICKET_CONTEXT_WORDS)
+_filter_mtime: float | None = None
+_filter_checked_at = 0.0
+
+def reload_content_filter(force: bool = False) -> ContentFilter:
+    """
+    Rebuilds the filter from CONTENT_FILTER_PATH (JSON: {"blacklist": [...], "context": [...]})
+    when the file changed. Checked at most every CONTENT_FILTER_RELOAD_SECONDS, so edits
+    apply without a restart. A missing or broken file keeps the current vocabularies.
+    """
+    global _content_filter, _filter_mtime, _filter_checked_at
+    now = time.monotonic()
+    if not force and now - _filter_checked_at < settings.CONTENT_FILTER_RELOAD_SECONDS:
+        return _content_filter
+    _filter_checked_at = now
+
+    path = settings.CONTENT_FILTER_PATH
+    if not path:
+        return _content_filter
     try:
-        timeline = raw_data.get("result", {}).get("timeline_response", {}).get("timeline", {})
-        instructions = timeline.get("instructions", [])
-        
-        entries = []
-        for instr in instructions:
-            if instr.get("__typename") == "TimelineAddEntries":
-                entries.extend(instr.get("entries", []))
-        
-        logger.info(f"🔍 Normalizer found {len(entries)} raw timeline entries.")
-
-        for i, entry in enumerate(entries):
-            try:
-                content = entry.get("content", {})
-                item_content = content.get("content", {})
-                tweet_results = item_content.get("tweet_results", {}).get("result", {})
-                
-                if not tweet_results or tweet_results.get("__typename") == "TweetUnavailable":
-                    continue
+        mtime = os.path.getmtime(path)
+        if force or mtime != _filter_mtime:
+            with open(path) as f:
+                vocab = json.load(f)
+            _content_filter = ContentFilter(
+                set(vocab.get("blacklist", BLACKLIST_KEYWORDS)),
+                set(vocab.get("context", CRICKET_CONTEXT_WORDS)),
+            )
+            _filter_mtime = mtime
+            logger.info(
+                f"Content filter loaded from {path}: {len(_content_filter.blacklist)} blacklist, "
+                f"{len(_content_filter.context)} context words"
+            )
+    except (OSError, ValueError) as e:
+        logger.error(f"Content filter reload from {path} failed, keeping current rules: {e}")
+    return _content_filter
 
-                # Data Extraction
-                legacy = tweet_results.get("legacy", {})
-                details = tweet_results.get("details", {})
-                core_user = tweet_results.get("core", {}).get("user_results", {}).get("result", {})
-                
-                tweet_id = tweet_results.get("rest_id")
-                text = details.get("full_text") or legacy.get("full_text") or ""
-                
-                # --- FILTER CHECK ---
-                if not is_valid_content(text):
-                    # logger.info(f"   🗑️ Filtered Tweet #{i}: {text[:30]}...")
+def is_valid_content(text: str) -> bool:
+    return reload_content_filter().is_valid(text)
+
+# --- Twitter timeline parsing ---
+# Entries are walked one at a time so a multi-megabyte page never becomes one big
+# list of posts. Raw bytes aren't even decoded into a dict tree: ijson builds
+# entries one by one from the token stream.
+
+_INSTRUCTIONS_PREFIX = "result.timeline_response.timeline.instructions.item"
+_ENTRIES_PREFIX = f"{_INSTRUCTIONS_PREFIX}.entries.item"
+_ENTRY_PREFIXES = (_ENTRIES_PREFIX, f"{_INSTRUCTIONS_PREFIX}.entry")
+
+def _instruction_kind(typename: str | None) -> str:
+    return "add" if typename == "TimelineAddEntries" else "replace"
+
+def _stream_timeline_entries(raw: bytes) -> Iterator[tuple[str, Dict[str, Any]]]:
+    # Single pass over the token stream; only the entry being built is held in memory.
+    # An instruction's entries are classified by its __typename like the dict path; the
+    # rare entries that precede it in the object wait for it (or the instruction's end)
+    builder = None
+    target = None
+    typename = None
+    pending: list[Dict[str, Any]] = []
+    for prefix, event, value in ijson.parse(io.BytesIO(raw), use_float=True):
+        if builder is None:
+            if prefix == _INSTRUCTIONS_PREFIX and event == "start_map":
+                typename, pending = None, []
+            elif prefix == f"{_INSTRUCTIONS_PREFIX}.__typename":
+                typename = value
+                for entry in pending:
+                    yield _instruction_kind(typename), entry
+                pending = []
+            elif prefix == _INSTRUCTIONS_PREFIX and event == "end_map":
+                for entry in pending:
+                    yield _instruction_kind(typename), entry
+                pending = []
+            elif event == "start_map" and prefix in _ENTRY_PREFIXES:
+                builder, target = ijson.ObjectBuilder(), prefix
+                builder.event(event, value)
+            continue
+        builder.event(event, value)
+        if event == "end_map" and prefix == target:
+            entry, builder = builder.value, None
+            if target != _ENTRIES_PREFIX:
+                # A lone "entry" is a replace (cursors)
+                yield "replace", entry
+            elif typename is None:
+                pending.append(entry)
+            else:
+                yield _instruction_kind(typename), entry
+
+def iter_timeline_entries(raw_data: Dict[str, Any] | bytes) -> Iterator[tuple[str, Dict[str, Any]]]:
+    """
+    Yields (kind, entry) for each entry of a Twitter241 timeline page, lazily.
+    kind is 'add' for TimelineAddEntries entries (tweets + cursors) and 'replace' otherwise.
+    """
+    if isinstance(raw_data, (bytes, bytearray)):
+        if raw_data:
+            yield from _stream_timeline_entries(bytes(raw_data))
+        return
+
+    timeline = (raw_data or {}).get("result", {}).get("timeline_response", {}).get("timeline", {})
+    for instr in timeline.get("instructions", []):
+        kind = _instruction_kind(instr.get("__typename"))
+        for entry in instr.get("entries", []):
+            yield kind, entry
+        if instr.get("entry"):
+            yield "replace", instr["entry"]
+
+def _entry_cursor(entry: Dict[str, Any]) -> str | None:
+    content = entry.get("content", {})
+    if content.get("cursorType") == "Bottom" or entry.get("entryId", "").startswith("cursor-bottom"):
+        return content.get("value")
+    return None
+
+def normalize_tweet_entry(entry: Dict[str, Any]) -> EngagementPostDomain | None:
+    """
+    One timeline entry -> post, or None for non-tweets and filtered content.
+    """
+    content = entry.get("content", {})
+    item_content = content.get("content", {})
+    tweet_results = item_content.get("tweet_results", {}).get("result", {})
+
+    if not tweet_results or tweet_results.get("__typename") == "TweetUnavailable":
+        return None
+
+    # Data Extraction
+    legacy = tweet_results.get("legacy", {})
+    details = tweet_results.get("details", {})
+    core_user = tweet_results.get("core", {}).get("user_results", {}).get("result", {})
+
+    tweet_id = tweet_results.get("rest_id")
+    text = details.get("full_text") or legacy.get("full_text") or ""
+
+    # --- FILTER CHECK ---
+    if not is_valid_content(text):
+        return None
+    # --------------------
+
+    # Timestamp
+    created_at_ms = details.get("created_at_ms") or legacy.get("created_at")
+    # Handle standard twitter date format if ms not provided
+    if created_at_ms and str(created_at_ms).isdigit():
+        published_at = datetime.fromtimestamp(int(created_at_ms)/1000)
+    else:
+        published_at = datetime.now()
+
+    # Media
+    media_list = []
+    medias = legacy.get("extended_entities", {}).get("media", []) or \
+             tweet_results.get("media_entities", [])
+
+    for m in medias:
+        m_url = m.get("media_url_https") or m.get("media_info", {}).get("original_img_url")
+        if m_url:
+            media_list.append(EngagementMedia(type=m.get("type", "image"), url=m_url))
+
+    # Metrics
+    counts = tweet_results.get("counts") or legacy
+    metrics = EngagementMetrics(
+        likes=counts.get("favorite_count", 0),
+        shares=counts.get("retweet_count", 0),
+        views=int(tweet_results.get("views", {}).get("count", 0) or 0)
+    )
+
+    # Author
+    user_legacy = core_user.get("legacy", {})
+    user_core = core_user.get("core", {})
+    avatar = core_user.get("avatar", {}).get("image_url") or user_legacy.get("profile_image_url_https")
+
+    author = EngagementAuthor(
+        name=user_core.get("name") or user_legacy.get("name", "Unknown"),
+        handle=user_core.get("screen_name") or user_legacy.get("screen_name", ""),
+        avatar=avatar,
+        profile_url=f"https://twitter.com/{user_core.get('screen_name')}"
+    )
+
+    return EngagementPostDomain(
+        source="twitter",
+        source_id=tweet_id,
+        text=text,
+        url=f"https://twitter.com/x/status/{tweet_id}",
+        media=media_list,
+        author=author,
+        metrics=metrics,
+        published_at=published_at,
+        fetched_at=datetime.now()
+    )
+
+class TwitterTimeline:
+    """
+    Iterates the valid posts of one timeline page as they are parsed.
+    `cursor` (the 'bottom' cursor, for the next, older page) and the entry
+    counts are filled in as the page is consumed; `truncated` is set if the
+    payload broke off, in which case `cursor` may be missing.
+    """
+    def __init__(self, raw_data: Dict[str, Any] | bytes):
+        self.raw_data = raw_data
+        self.cursor: str | None = None
+        self.truncated = False
+        self.entries = 0
+        self.posts = 0
+
+    def __iter__(self) -> Iterator[EngagementPostDomain]:
+        try:
+            for kind, entry in iter_timeline_entries(self.raw_data):
+                cursor = _entry_cursor(entry)
+                if cursor:
+                    self.cursor = cursor
                     continue
-                # --------------------
-
-                # Timestamp
-                created_at_ms = details.get("created_at_ms") or legacy.get("created_at")
-                # Handle standard twitter date format if ms not provided
-                if created_at_ms and str(created_at_ms).isdigit():
-                    published_at = datetime.fromtimestamp(int(created_at_ms)/1000)
-                else:
-                    published_at = datetime.now()
-
-                # Media
-                media_list = []
-                medias = legacy.get("extended_entities", {}).get("media", []) or \
-                         tweet_results.get("media_entities", [])
-                
-                for m in medias:
-                    m_url = m.get("media_url_https") or m.get("media_info", {}).get("original_img_url")
-                    if m_url:
-                        media_list.append(EngagementMedia(type=m.get("type", "image"), url=m_url))
-
-                # Metrics
-                counts = tweet_results.get("counts") or legacy
-                metrics = EngagementMetrics(
-                    likes=counts.get("favorite_count", 0),
-                    shares=counts.get("retweet_count", 0),
-                    views=int(tweet_results.get("views", {}).get("count", 0) or 0)
-                )
-
-                # Author
-                user_legacy = core_user.get("legacy", {})
-                user_core = core_user.get("core", {})
-                avatar = core_user.get("avatar", {}).get("image_url") or user_legacy.get("profile_image_url_https")
-                
-                author = EngagementAuthor(
-                    name=user_core.get("name") or user_legacy.get("name", "Unknown"),
-                    handle=user_core.get("screen_name") or user_legacy.get("screen_name", ""),
-                    avatar=avatar,
-                    profile_url=f"https://twitter.com/{user_core.get('screen_name')}"
-                )
-
-                posts.append(EngagementPostDomain(
-                    source="twitter",
-                    source_id=tweet_id,
-                    text=text,
-                    url=f"https://twitter.com/x/status/{tweet_id}",
-                    media=media_list,
-                    author=author,
-                    metrics=metrics,
-                    published_at=published_at,
-                    fetched_at=datetime.now()
-                ))
-
-            except Exception as e:
-                logger.warning(f"⚠️ Error parsing tweet #{i}: {e}")
-                continue
+                if kind != "add":
+                    continue
+                self.entries += 1
+                try:
+                    post = normalize_tweet_entry(entry)
+                except Exception as e:
+                    logger.warning(f"⚠️ Error parsing tweet #{self.entries}: {e}")
+                    continue
+                if post:
+                    self.posts += 1
+                    yield post
+        except Exception as e:
+            # Truncated/invalid payload: keep what was already yielded
+            logger.error(f"❌ Critical Normalizer Failure: {e}")
+            self.truncated = True
+        self.raw_data = None
 
-    except Exception as e:
-        logger.error(f"❌ Critical Normalizer Failure: {e}")
+def normalize_twitter_response(raw_data: Dict[str, Any] | bytes) -> List[EngagementPostDomain]:
+    """
+    Parses Twitter241 (RapidAPI) JSON into domain models.
+    """
+    # LOGGING START
+    if not raw_data:
+        logger.error("❌ Normalizer received EMPTY raw_data")
         return []
 
-    logger.info(f"✅ Normalizer finished. {len(posts)}/{len(entries)} valid tweets extracted.")
+    timeline = TwitterTimeline(raw_data)
+    posts = list(timeline)
+    logger.info(f"✅ Normalizer finished. {timeline.posts}/{timeline.entries} valid tweets extracted.")
     return posts
 
 def normalize_youtube_response(raw_data: Dict[str, Any]) -> List[EngagementPostDomain]:
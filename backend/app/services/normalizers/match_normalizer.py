@@ -1,6 +1,13 @@
 from app.domain.models.live import LiveMatch, InningScore
 from datetime import datetime
 
+def is_complete_live_entry(raw: dict) -> bool:
+    """
+    True if a /livescores list entry carries everything normalize_live_match needs,
+    so the poller can skip the per-fixture detail call.
+    """
+    return bool(raw.get("id")) and "status" in raw and isinstance(raw.get("runs"), list)
+
 def normalize_live_match(raw: dict) -> LiveMatch:
     """
     Converts raw SportMonks fixture detail into a lightweight Redis LiveMatch.
@@ -11,9 +11,9 @@ async def get_raw_live_matches():
         logger.exception("Failed to fetch live matches from SportMonks API")
         raise
 
-async def get_raw_live_match(match_id: int):
+async def get_raw_live_match(match_id: int, deadline: float | None = None):
     try:
-        payload = await sportmonks_api.fetch_match_by_id_raw(match_id)
+        payload = await sportmonks_api.fetch_match_by_id_raw(match_id, deadline=deadline)
         return payload.get("data", {})
     
     except Exception:
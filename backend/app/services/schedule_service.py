@@ -1,9 +1,17 @@
+import hashlib
+import json
 import logging
+from sqlalchemy import func, literal_column
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
+from app.core.config import settings
+
+from app.infrastructure.db import run_db
+from app.infrastructure.redis_async import redis_async
 from app.infrastructure.external_api import sportmonks_api
+from app.services.score_service import materialize_livescore_view
 from app.models.sql_match import Match
 
 logger = logging.getLogger(__name__)
@@ -65,89 +73,205 @@ def format_score_string(runs_data, team_id):
     
     return f"{score}/{wickets} ({overs})"
 
-async def sync_schedules_to_db(db: Session):
+SYNC_HWM_KEY = "schedule:sync:hwm"
+
+def next_match_start(db: Session, now: datetime) -> datetime | None:
+    """
+    Earliest kickoff among not-started fixtures, including ones up to 6h overdue
+    (delayed starts). Blocking; run via run_db.
+    """
+    return db.query(func.min(Match.start_time)).filter(
+        Match.status == "NS",
+        Match.start_time >= now - timedelta(hours=6),
+    ).scalar()
+
+def pick_sync_window(
+    last_full_sync: datetime | None,
+    last_hot_sync: datetime | None,
+    now: datetime,
+    force_full: bool = False,
+    force_hot: bool = False,
+) -> tuple[str, date, date] | None:
+    """
+    Chooses which fixture window to refetch from the per-window high-water marks.
+    The full +/-30 day window is pulled when forced or stale; otherwise the hot band,
+    unless it was refreshed within the current interval (restart / leader failover).
+    Returns None when nothing is due.
+    """
+    today = now.date()
+    full_due = (
+        force_full
+        or last_full_sync is None
+        or now - last_full_sync >= timedelta(hours=settings.SCHEDULE_FULL_SYNC_HOURS)
+    )
+    if full_due:
+        return "full", today - timedelta(days=30), today + timedelta(days=30)
+
+    # The scheduler may fire up to SCHEDULER_JITTER early; only sooner runs are skipped
+    hot_interval = timedelta(minutes=settings.SCHEDULE_HOT_SYNC_MINUTES * (1 - settings.SCHEDULER_JITTER))
+    if not force_hot and last_hot_sync is not None and now - last_hot_sync < hot_interval:
+        return None
+    return (
+        "hot",
+        today - timedelta(days=settings.SCHEDULE_HOT_PAST_DAYS),
+        today + timedelta(days=settings.SCHEDULE_HOT_FUTURE_DAYS),
+    )
+
+async def sync_schedules_to_db(force_full: bool = False, force_hot: bool = False):
     """
     Fetches fixtures from API and syncs them to Postgres.
-    Uses 'upsert' to handle updates efficiently.
+    Incremental: refreshes the hot band once per SCHEDULE_HOT_SYNC_MINUTES and the
+    full window only when its high-water mark is older than SCHEDULE_FULL_SYNC_HOURS
+    (both marks kept in Redis). The upsert runs on the DB executor so it never blocks the event loop.
+    """
+    now = datetime.now()
+    marks = await redis_async.hgetall(SYNC_HWM_KEY)
+    last_full_sync = datetime.fromisoformat(marks["full"]) if marks.get("full") else None
+    last_hot_sync = datetime.fromisoformat(marks["hot"]) if marks.get("hot") else None
+
+    picked = pick_sync_window(last_full_sync, last_hot_sync, now, force_full, force_hot)
+    if picked is None:
+        logger.info("Hot band synced recently, skipping schedule sync.")
+        return None
+    window, start_date, end_date = picked
+    logger.info(f"Starting {window} schedule sync ({start_date} .. {end_date})...")
+
+    fixtures = await sportmonks_api.fetch_fixtures_window(start_date, end_date)
+
+    if not fixtures:
+        logger.warning("No fixtures found in API response.")
+        return
+
+    counts = await run_db(store_fixtures, fixtures)
+
+    # Advance the high-water marks only after a successful write;
+    # the full window contains the hot band, so it refreshes both
+    synced = {"hot": now.isoformat()}
+    if window == "full":
+        synced["full"] = now.isoformat()
+    await redis_async.hset(SYNC_HWM_KEY, mapping=synced)
+
+    if counts["inserted"] or counts["updated"]:
+        await run_db(materialize_livescore_view)
+    return {"window": window, **counts}
+
+def build_match_row(f: dict) -> dict:
     """
-    logger.info("Starting schedule sync...")
+    Maps one raw SportMonks fixture to a `matches` row (without updated_at).
+    """
+    start_time_str = f.get("starting_at")
+    start_time = None
+    if start_time_str:
+        start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
+
+    local_team = f.get('localteam', {})
+    visitor_team = f.get('visitorteam', {})
+    local_id = local_team.get('id')
+    visitor_id = visitor_team.get('id')
     
-    try:
-        raw_data = await sportmonks_api.fetch_fixtures_raw()
-        fixtures = raw_data.get("data", [])
+    match_title = f"{local_team.get('name', 'Unknown')} vs {visitor_team.get('name', 'Unknown')}"
+    status = f.get("status")
+
+    home_score_str = None
+    away_score_str = None
+    result_note = None
+
+    # Only calculate for Finished/Live matches to save processing
+    if status in ['Finished', 'NS', 'Live', '1st Innings', '2nd Innings', 'Innings Break']:
+        runs = f.get('runs', [])
         
-        if not fixtures:
-            logger.warning("No fixtures found in API response.")
-            return
-
-        count = 0
-        for f in fixtures:
-            start_time_str = f.get("starting_at")
-            start_time = None
-            if start_time_str:
-                start_time = datetime.fromisoformat(start_time_str.replace("Z", "+00:00"))
-
-            local_team = f.get('localteam', {})
-            visitor_team = f.get('visitorteam', {})
-            local_id = local_team.get('id')
-            visitor_id = visitor_team.get('id')
-            
-            match_title = f"{local_team.get('name', 'Unknown')} vs {visitor_team.get('name', 'Unknown')}"
-            status = f.get("status")
-
-            home_score_str = None
-            away_score_str = None
-            result_note = None
-
-            # Only calculate for Finished/Live matches to save processing
-            if status in ['Finished', 'NS', 'Live', '1st Innings', '2nd Innings', 'Innings Break']:
-                runs = f.get('runs', [])
-                
-                # Format "150/3 (20.0)" strings
-                home_score_str = format_score_string(runs, local_id)
-                away_score_str = format_score_string(runs, visitor_id)
-                
-                # Calculate "India won by..." only if finished
-                if status == 'Finished':
-                    # First try to use the API provided note
-                    result_note = f.get('note')
-                    # If API note is missing, calculate it manually
-                    if not result_note:
-                        result_note = calculate_cricket_result(
-                            local_id, visitor_id, runs, 
-                            local_team.get('name'), visitor_team.get('name')
-                        )
-
-            # Upsert Payload
-            match_data = {
-                "match_id": str(f["id"]),
-                "title": match_title,
-                "status": status,
-                "match_type": f.get("type"),
-                "start_time": start_time,
-                "league": f.get("league"),        
-                "venue": f.get("venue"),          
-                "home_team": local_team,  
-                "away_team": visitor_team,
-                "home_score": home_score_str,
-                "away_score": away_score_str,
-                "result_note": result_note,
-                "updated_at": datetime.now()
-            }
+        # Format "150/3 (20.0)" strings
+        home_score_str = format_score_string(runs, local_id)
+        away_score_str = format_score_string(runs, visitor_id)
+        
+        # Calculate "India won by..." only if finished
+        if status == 'Finished':
+            # First try to use the API provided note
+            result_note = f.get('note')
+            # If API note is missing, calculate it manually
+            if not result_note:
+                result_note = calculate_cricket_result(
+                    local_id, visitor_id, runs, 
+                    local_team.get('name'), visitor_team.get('name')
+                )
+
+    # Upsert Payload
+    match_data = {
+        "match_id": str(f["id"]),
+        "title": match_title,
+        "status": status,
+        "match_type": f.get("type"),
+        "start_time": start_time,
+        "league": f.get("league"),        
+        "venue": f.get("venue"),          
+        "home_team": local_team,  
+        "away_team": visitor_team,
+        "home_score": home_score_str,
+        "away_score": away_score_str,
+        "result_note": result_note,
+    }
+    match_data["content_hash"] = compute_content_hash(match_data)
+    return match_data
 
-            stmt = insert(Match).values(match_data)
+def compute_content_hash(match_data: dict) -> str:
+    """
+    Stable fingerprint of a row's synced content, used to skip no-op updates.
+    """
+    payload = json.dumps(match_data, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+def store_fixtures(db: Session, fixtures: list) -> dict:
+    """
+    Bulk upserts fixtures in multi-row INSERT ... ON CONFLICT statements of
+    SCHEDULE_SYNC_CHUNK_SIZE rows. Rows whose content hash is unchanged are left
+    untouched (no updated_at bump, no WAL). Blocking; run via run_db from async code.
+    """
+    # Dedupe by match_id: Postgres rejects a statement that touches the same row twice
+    rows = {}
+    for f in fixtures:
+        try:
+            row = build_match_row(f)
+            rows[row["match_id"]] = row
+        except Exception as e:
+            logger.warning(f"Skipping fixture {f.get('id')} due to error: {e}")
+    rows = list(rows.values())
+
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    chunk_size = max(1, settings.SCHEDULE_SYNC_CHUNK_SIZE)
+
+    try:
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            now = datetime.now()
+            for row in chunk:
+                row["updated_at"] = now
+
+            stmt = insert(Match).values(chunk)
+            update_cols = {
+                col: stmt.excluded[col]
+                for col in chunk[0].keys() if col != "match_id"
+            }
             stmt = stmt.on_conflict_do_update(
                 index_elements=[Match.match_id],
-                set_=match_data
-            )
-            
-            db.execute(stmt)
-            count += 1
+                set_=update_cols,
+                where=Match.content_hash.is_distinct_from(stmt.excluded.content_hash)
+            ).returning(Match.match_id, literal_column("(xmax = 0)").label("inserted"))
+
+            # Only inserted or genuinely changed rows come back from RETURNING
+            written = db.execute(stmt).all()
+            inserted = sum(1 for r in written if r.inserted)
+            counts["inserted"] += inserted
+            counts["updated"] += len(written) - inserted
+            counts["unchanged"] += len(chunk) - len(written)
 
         db.commit()
-        logger.info(f"Successfully synced {count} fixtures (with scores) to Database.")
+        logger.info(
+            f"Synced {len(rows)} fixtures: {counts['inserted']} inserted, "
+            f"{counts['updated']} updated, {counts['unchanged']} unchanged."
+        )
+        return counts
 
     except Exception:
         logger.exception("Failed to sync schedules")
         db.rollback()
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+from app.core import metrics
+from app.core.serialization import dumps_str, loads
+from app.infrastructure.db import run_db
+from app.infrastructure.redis_async import redis_async
+from app.services.schedule_service import next_match_start
+
+logger = logging.getLogger(__name__)
+
+# Hash of job name -> last/next run, so any worker can report jobs led elsewhere
+SCHEDULER_STATE_KEY = "scheduler:jobs"
+
+# SportMonks statuses while play is actually happening
+IN_PLAY_STATUSES = {"Live", "1st Innings", "2nd Innings", "3rd Innings", "4th Innings"}
+
+
+def live_poll_interval(statuses: list[str], next_start: datetime | None, now: datetime) -> float:
+    """
+    Seconds until the next live poll:
+    in play -> LIVE; only breaks/delays live -> BREAK;
+    nothing live -> halve the distance to the next kickoff, between BREAK and IDLE.
+    """
+    if any(s in IN_PLAY_STATUSES for s in statuses):
+        return settings.LIVE_POLL_INTERVAL_LIVE
+    if statuses:
+        return settings.LIVE_POLL_INTERVAL_BREAK
+    if next_start is None:
+        return settings.LIVE_POLL_INTERVAL_IDLE
+    until_start = (next_start - now).total_seconds()
+    return min(settings.LIVE_POLL_INTERVAL_IDLE, max(settings.LIVE_POLL_INTERVAL_BREAK, until_start / 2))
+
+
+def jittered(seconds: float, fraction: float | None = None) -> float:
+    """
+    Spreads runs by +/- `fraction` so workers and jobs don't fire in lockstep.
+    """
+    fraction = settings.SCHEDULER_JITTER if fraction is None else fraction
+    return max(1.0, seconds * random.uniform(1 - fraction, 1 + fraction))
+
+
+class Scheduler:
+    """
+    Runs each registered job in its own loop. After every run the job's interval
+    function sees the run's result and picks the next delay, so cadence follows
+    match state instead of fixed sleeps.
+    """
+    def __init__(self):
+        self._jobs: dict[str, tuple[Callable[[], Awaitable[Any]], Callable[[Any], Awaitable[float]], float]] = {}
+        self._state: dict[str, dict] = {}
+        self._last_result: dict[str, Any] = {}
+
+    def register(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[Any]],
+        interval: Callable[[Any], Awaitable[float]],
+        base_interval: float,
+    ):
+        """
+        base_interval (seconds) is the job's normal cadence, used whenever its
+        interval policy itself fails (e.g. a Redis blip while checking live state).
+        """
+        self._jobs[name] = (job, interval, base_interval)
+
+    async def run(self, name: str):
+        """
+        The long-lived loop for one job; run it under run_as_leader(name, ...).
+        """
+        job, interval, base_interval = self._jobs[name]
+        while True:
+            started = time.time()
+            result, error = None, None
+            logger.info(f"Scheduled Task: {name}")
+            try:
+                result = self._last_result[name] = await job()
+            except Exception as e:
+                # Keep the cadence of the last good run (e.g. stay fast mid-match on a blip)
+                result = self._last_result.get(name)
+                error = str(e)
+                logger.error(f"Scheduled job {name} failed: {e}")
+                metrics.incr(f"scheduler.{name}.errors")
+
+            try:
+                delay = jittered(await interval(result))
+            except Exception as e:
+                logger.error(f"Interval for {name} failed, using its base interval: {e}")
+                delay = jittered(base_interval)
+
+            await self._record(name, {
+                "last_run": datetime.fromtimestamp(started, timezone.utc).isoformat(),
+                "last_duration_ms": round((time.time() - started) * 1000, 2),
+                "last_error": error,
+                "interval_s": round(delay, 1),
+                "next_run": datetime.fromtimestamp(time.time() + delay, timezone.utc).isoformat(),
+            })
+            await asyncio.sleep(delay)
+
+    async def _record(self, name: str, state: dict):
+        self._state[name] = state
+        metrics.set_gauge(f"scheduler.{name}", state)
+        try:
+            await redis_async.hset(SCHEDULER_STATE_KEY, name, dumps_str(state))
+        except Exception as e:
+            logger.warning(f"Could not publish scheduler state for {name}: {e}")
+
+    async def status(self) -> dict:
+        """
+        Last/next run per job, across workers.
+        """
+        try:
+            stored = await redis_async.hgetall(SCHEDULER_STATE_KEY)
+            return {name: loads(state) for name, state in stored.items()}
+        except Exception:
+            return dict(self._state)
+
+
+scheduler = Scheduler()
+
+
+# --- Interval policies ---
+
+async def live_interval(statuses: dict[str, str] | None) -> float:
+    now = datetime.now(timezone.utc)
+    next_start = None
+    if not statuses:
+        next_start = await run_db(next_match_start, now)
+        if next_start is not None and next_start.tzinfo is None:
+            next_start = next_start.replace(tzinfo=timezone.utc)
+    return live_poll_interval(list((statuses or {}).values()), next_start, now)
+
+
+def engagement_interval(minutes: int) -> Callable[[Any], Awaitable[float]]:
+    """
+    Social feeds move with the cricket: twice as often while any match is live.
+    """
+    async def interval(_result) -> float:
+        live = await redis_async.exists("live:matches")
+        return minutes * 60 / (2 if live else 1)
+    return interval
+
+
+def fixed_interval(minutes: float) -> Callable[[Any], Awaitable[float]]:
+    async def interval(_result) -> float:
+        return minutes * 60
+    return interval
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, timezone
-import json
+import hashlib
 
 from app.models.sql_match import Match
 from app.domain.models.live import LiveMatch
@@ -9,7 +9,9 @@ from app.domain.models.livescore_view import (
     TeamsContainer, ScoresContainer, ScoreView, 
     CurrentView, TossView
 )
-from app.infrastructure.redis_client import redis_client
+from app.core.serialization import dumps_str
+from app.infrastructure.redis_client import redis_client, mget_raw
+from app.infrastructure.snapshot_codec import decode_snapshot
 
 def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
     # 1. Define Time Window (UTC Now - 24h to + 36h)
@@ -37,11 +39,11 @@ def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
     redis_map = {}
     if live_ids:
         keys = [f"live:match:{mid}" for mid in live_ids]
-        raw_list = redis_client.mget(keys)
+        raw_list = mget_raw(keys)
         for mid, raw in zip(live_ids, raw_list):
             if raw:
                 try:
-                    redis_map[mid] = LiveMatch(**json.loads(raw))
+                    redis_map[mid] = LiveMatch(**decode_snapshot(raw))
                 except: continue
 
     results = []
@@ -123,4 +125,25 @@ def get_live_scores_view(db: Session) -> list[LiveScoreCard]:
         )
         results.append(card)
 
-    return results
\ No newline at end of file
+    return results
+
+LIVESCORE_VIEW_KEY = "livescore:view"
+
+def materialize_livescore_view(db: Session) -> dict:
+    """
+    Builds the livescore card list once and stores the encoded body plus its
+    version (ETag) in a Redis hash, so /livescore is a single HGETALL.
+    Skips the write when the content hasn't changed. Blocking; run via run_db.
+    """
+    cards = get_live_scores_view(db)
+    body = dumps_str([c.model_dump(mode='json') for c in cards])
+    etag = hashlib.sha1(body.encode("utf-8")).hexdigest()[:16]
+
+    view = {"etag": etag, "body": body}
+    pipe = redis_client.pipeline(transaction=True)
+    if redis_client.hget(LIVESCORE_VIEW_KEY, "etag") != etag:
+        pipe.hset(LIVESCORE_VIEW_KEY, mapping=view)
+    # Expire if the poller stops, so the endpoint falls back to a live computation
+    pipe.expire(LIVESCORE_VIEW_KEY, 600)
+    pipe.execute()
+    return view
@@ -52,6 +52,13 @@ def create_mock_match(innings_data):
         last_updated=datetime.now()
     )
 
+@pytest.fixture
+def db_module_import(monkeypatch):
+    """Lets modules that import app.infrastructure.db load without a configured database (nothing connects)."""
+    from app.core.config import settings
+    if not settings.DATABASE_URL:
+        monkeypatch.setattr(settings, "DATABASE_URL", "sqlite://")
+
 def test_diff_service_fresh_match():
     """Test comparing against None (First poll) returns no events."""
     new_match = create_mock_match([
@@ -101,4 +108,722 @@ def test_diff_service_new_inning_no_crash():
     
     # Should return empty list (no events for starting 0/0) or just not crash
     events = detect_changes(old_match, new_match)
-    assert isinstance(events, list)
\ No newline at end of file
+    assert isinstance(events, list)
+
+# Single-shot Live Polling (List Entry Normalization)
+def test_livescores_entry_with_runs_is_complete():
+    """Test that a /livescores entry carrying runs is normalized without a detail call."""
+    from app.services.normalizers.match_normalizer import is_complete_live_entry, normalize_live_match
+    entry = {
+        "id": 55, "status": "1st Innings", "note": "", "elected": "batting", "toss_won_team_id": 10,
+        "runs": [{"inning": 1, "team_id": 10, "score": 87, "wickets": 2, "overs": 9.3}]
+    }
+    assert is_complete_live_entry(entry) is True
+    match = normalize_live_match(entry)
+    assert match.innings[0].score == 87
+    assert match.current_batting_team_id == 10
+
+def test_livescores_entry_without_runs_needs_detail():
+    """Test that an entry missing the runs include falls back to the detail fetch."""
+    from app.services.normalizers.match_normalizer import is_complete_live_entry
+    assert is_complete_live_entry({"id": 55, "status": "Live"}) is False
+
+# Live Stream Deltas
+def test_snapshot_delta_only_changed_fields():
+    """Test that stream deltas carry only fields that changed (ignoring last_updated)."""
+    from app.services.live_stream_service import snapshot_delta
+    old = {"match_id": 1, "status": "Live", "note": "", "last_updated": "t1"}
+    new = {"match_id": 1, "status": "Live", "note": "Target 150", "last_updated": "t2"}
+    assert snapshot_delta(old, new) == {"note": "Target 150"}
+    assert snapshot_delta(None, new) == new
+
+def test_broadcaster_never_serves_a_delta_as_a_snapshot(monkeypatch):
+    """Test that a worker holding only deltas for a live match loads its full snapshot from Redis on connect."""
+    import asyncio
+    from app.infrastructure.snapshot_codec import encode_snapshot
+    from app.services import live_stream_service as lss
+
+    full = {"match_id": 7, "status": "2nd Innings", "note": "Target 150", "innings": [],
+            "toss_won_team_id": None, "toss_elected": None, "current_batting_team_id": None,
+            "last_updated": "2025-07-01T12:00:00", "last_ball_id": None}
+    fetched = []
+
+    async def mget_raw(keys):
+        fetched.extend(keys)
+        return [encode_snapshot(full) for _ in keys]
+
+    monkeypatch.setattr(lss, "mget_raw", mget_raw)
+    broadcaster = lss.LiveBroadcaster()
+    broadcaster.publish([{"type": "delta", "match_id": "7", "data": {"note": "Target 150"}}], live_ids=["7"])
+
+    snapshots = asyncio.run(broadcaster.initial_snapshots())
+    assert snapshots == [{"type": "snapshot", "match_id": "7", "data": full}]
+    # Now held in memory; later deltas merge into it without another read
+    broadcaster.publish([{"type": "delta", "match_id": "7", "data": {"note": "Target 151"}}], live_ids=["7"])
+    assert asyncio.run(broadcaster.initial_snapshots({"7"}))[0]["data"]["note"] == "Target 151"
+    assert fetched == ["live:match:7"]
+
+def test_poller_holds_last_known_good_snapshots_within_ttl(monkeypatch, db_module_import):
+    """Test that failed fetches keep fresh snapshots listed without rewriting them, and drop stale ones."""
+    import asyncio
+    from datetime import timedelta
+    from app.core.config import settings
+    from app.infrastructure.snapshot_codec import encode_snapshot
+    from app.services import live_snapshot_service as lsvc
+
+    def snapshot(match_id, age):
+        return {"match_id": match_id, "status": "2nd Innings", "note": "", "innings": [],
+                "toss_won_team_id": None, "toss_elected": None, "current_batting_team_id": None,
+                "last_updated": (datetime.now() - timedelta(seconds=age)).isoformat(), "last_ball_id": None}
+
+    stored = {"live:match:2": snapshot(2, 60), "live:match:3": snapshot(3, settings.SPORTMONKS_LKG_TTL + 60)}
+    written = {}
+
+    class FakeBatch:
+        def set(self, key, value, ttl=60):
+            written[key] = value
+
+        def push_events(self, key, events, ttl=300):
+            pass
+
+        async def execute(self):
+            pass
+
+    class FakeRedis:
+        async def get(self, key):
+            return "2,3"
+
+        async def set(self, key, value, ex=None):
+            written[key] = value
+
+        async def delete(self, key):
+            written.pop(key, None)
+
+    async def livescores():
+        return {"data": [{"id": 1}, {"id": 2}, {"id": 3}]}
+
+    async def details(match_ids):
+        return {"1": {"id": 1}}
+
+    async def mget_raw(keys):
+        return [encode_snapshot(stored[k]) if k in stored else None for k in keys]
+
+    async def noop(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(lsvc, "get_raw_live_matches", livescores)
+    monkeypatch.setattr(lsvc, "fetch_live_details", details)
+    monkeypatch.setattr(lsvc, "normalize_live_match", lambda raw: create_mock_match([]).model_copy(update={"match_id": 1}))
+    monkeypatch.setattr(lsvc, "mget_raw", mget_raw)
+    monkeypatch.setattr(lsvc, "RedisBatch", FakeBatch)
+    monkeypatch.setattr(lsvc, "redis_async", FakeRedis())
+    monkeypatch.setattr(lsvc, "publish_live_updates", noop)
+    monkeypatch.setattr(lsvc, "run_db", noop)
+
+    statuses = asyncio.run(lsvc._poll_and_store_live_matches())
+    assert statuses == {"1": "Live", "2": "2nd Innings"}
+    assert written["live:matches"] == "1,2"
+    assert "live:match:1" in written and "live:match:2" not in written
+
+    async def livescores_down():
+        raise ConnectionError("SportMonks down")
+
+    written.clear()
+    monkeypatch.setattr(lsvc, "get_raw_live_matches", livescores_down)
+    with pytest.raises(ConnectionError):
+        asyncio.run(lsvc._poll_and_store_live_matches())
+    assert written == {"live:matches": "2"}
+
+# L1 Cache (LRU + Versioning)
+def test_l1_cache_evicts_lru_and_respects_version():
+    """Test that the L1 cache evicts the least recently used key and drops stale versions."""
+    from app.infrastructure.tiered_cache import LRUCache, _MISSING
+    lru = LRUCache(max_entries=2)
+    lru.set("a", 1, ttl=60, version=0)
+    lru.set("b", 2, ttl=60, version=0)
+    lru.get("a", version=0)            # 'a' is now most recently used
+    lru.set("c", 3, ttl=60, version=0) # evicts 'b'
+    assert lru.get("b", version=0) is _MISSING
+    assert lru.get("a", version=0) == 1
+    assert lru.get("a", version=1) is _MISSING
+
+# Snapshot Codec Tests
+
+def test_binary_snapshot_roundtrip_and_json_fallback():
+    """Test that binary snapshots decode to the same dict, and oversize ones fall back to JSON."""
+    from app.infrastructure.snapshot_codec import encode_snapshot, decode_snapshot, snapshot_json
+    match = LiveMatch(
+        match_id=1, status="2nd Innings", note="Target 150",
+        innings=[InningScore(inning=1, team_id=10, score=149, wickets=6, overs=20.0),
+                 InningScore(inning=2, team_id=20, score=80, wickets=2, overs=11.4)],
+        toss_won_team_id=10, toss_elected="batting", last_updated=datetime.now()
+    )
+    data = match.model_dump(mode='json')
+
+    raw = encode_snapshot(data, codec="binary")
+    assert raw[:1] != b"{"
+    assert len(raw) < len(encode_snapshot(data, codec="json"))
+    assert decode_snapshot(raw) == data
+    assert LiveMatch(**decode_snapshot(snapshot_json(raw))) == match
+
+    # Unknown fields don't fit the fixed layout: stored as JSON, still readable
+    extended = {**data, "extra": 1}
+    assert encode_snapshot(extended, codec="binary")[:1] == b"{"
+    assert decode_snapshot(encode_snapshot(extended, codec="binary")) == extended
+
+# Ball-by-ball Event Engine Tests
+
+def _ball(ball_id, over, runs=0, scoreboard="S1", **score):
+    return {"id": ball_id, "ball": over, "scoreboard": scoreboard, "score": {"runs": runs, **score}}
+
+def test_ball_engine_one_event_per_new_delivery():
+    """Test that several balls between polls each produce their own event, and only new balls are read."""
+    from app.services.diff_service import detect_ball_events
+    old_match = create_mock_match([{"inning": 1, "team_id": 10, "score": 100, "wickets": 2, "overs": 9.4}])
+    old_match.last_ball_id = 2
+    new_match = create_mock_match([{"inning": 1, "team_id": 10, "score": 110, "wickets": 3, "overs": 10.1}])
+    balls = [
+        _ball(1, 9.3), _ball(2, 9.4),
+        _ball(3, 9.5, 4, four=True),
+        _ball(4, 9.6, 6, six=True),
+        _ball(5, 10.1, 0, is_wicket=True, name="Catch Out"),
+    ]
+
+    events, last_id = detect_ball_events(old_match, new_match, balls)
+    types = [e.event_type for e in events]
+    assert types == [EventType.FOUR, EventType.SIX, EventType.OVER_END, EventType.WICKET]
+    assert last_id == 5
+
+    # Same feed again: nothing new
+    new_match.last_ball_id = last_id
+    assert detect_ball_events(new_match, new_match, balls) == ([], 5)
+
+def test_ball_engine_first_poll_skips_history():
+    """Test that a match seen for the first time doesn't replay every past delivery."""
+    from app.services.diff_service import detect_ball_events
+    new_match = create_mock_match([{"inning": 1, "team_id": 10, "score": 4, "wickets": 0, "overs": 0.2}])
+    events, last_id = detect_ball_events(None, new_match, [_ball(7, 0.1), _ball(8, 0.2, 4, four=True)])
+    assert events == [] and last_id == 8
+
+def test_ball_classifier_boundary_byes_are_extras():
+    """Test that byes/leg byes reaching the rope are extras, while a no-ball hit for six stays a six."""
+    from app.services.diff_service import classify_ball
+    assert classify_ball(_ball(1, 3.2, 4, name="4 Leg Bye", leg_bye=4, four=False))[0] == EventType.EXTRA
+    assert classify_ball(_ball(2, 3.3, 4, name="4 Byes"))[0] == EventType.EXTRA
+    assert classify_ball(_ball(3, 3.4, 4, name="4 Runs"))[0] == EventType.FOUR
+    assert classify_ball(_ball(4, 3.5, 7, name="No Ball", noball=True, six=True))[0] == EventType.SIX
+
+def test_diff_service_over_end_without_float_truncation():
+    """Test that 3.6 counts as a completed over and every over crossed between polls is reported."""
+    from app.services.diff_service import completed_overs
+    assert completed_overs(3.6) == 4
+    assert completed_overs(3.9999999) == 4
+    old_match = create_mock_match([{"inning": 1, "team_id": 10, "score": 20, "wickets": 0, "overs": 2.5}])
+    new_match = create_mock_match([{"inning": 1, "team_id": 10, "score": 35, "wickets": 0, "overs": 4.1}])
+    overs = [e.description for e in detect_changes(old_match, new_match) if e.event_type == EventType.OVER_END]
+    assert overs == ["End of Over 3", "End of Over 4"]
+
+# Upstream Budget Tests
+
+def test_retry_after_parses_seconds_and_http_dates():
+    """Test Retry-After handling for both header forms, with a default when absent/garbled."""
+    from email.utils import formatdate
+    import time
+    from app.infrastructure.rate_limiter import parse_retry_after
+    assert parse_retry_after("120") == 120
+    assert 25 <= parse_retry_after(formatdate(time.time() + 30, usegmt=True)) <= 30
+    assert parse_retry_after(None) == 60
+    assert parse_retry_after("soon") == 60
+
+# Resilience Tests
+
+def test_circuit_breaker_opens_then_probes_once():
+    """Test that the breaker opens after N failures and lets a single probe through after the reset timeout."""
+    from app.infrastructure.resilience import CircuitBreaker
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.opened_at is not None
+
+    # reset_timeout=0: immediately half-open, exactly one probe allowed
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_circuit_breaker_probe_slot_released_on_non_upstream_outcomes(monkeypatch):
+    """Test that a 4xx probe closes the breaker and a budget refusal frees the probe slot."""
+    import asyncio
+    import httpx
+    import pytest
+    from app.infrastructure import external_api
+    from app.infrastructure.rate_limiter import BudgetExceeded, Priority
+
+    api = external_api.SportMonksAPI()
+    api.breaker = external_api.CircuitBreaker("test", failure_threshold=1, reset_timeout=0)
+    api.breaker.record_failure()
+    url = "https://sportmonks.test/fixtures/0"
+
+    async def refused(*args, **kwargs):
+        raise BudgetExceeded("sportmonks", Priority.DETAIL, 5)
+
+    async def not_found(provider, priority, url, **kwargs):
+        return httpx.Response(404, request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(external_api, "budgeted_get", refused)
+    with pytest.raises(BudgetExceeded):
+        asyncio.run(api._get_json("fixture", Priority.DETAIL, url, {}, 1))
+    assert api.breaker.state == "half_open" and api.breaker.allow()
+    api.breaker.release_probe()
+
+    monkeypatch.setattr(external_api, "budgeted_get", not_found)
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(api._get_json("fixture", Priority.DETAIL, url, {}, 1))
+    assert api.breaker.state == "closed" and api.breaker.allow()
+
+def test_deadline_bounds_retries_and_trips_breaker(monkeypatch):
+    """Test that a call out of time raises its own timeout (counted by the breaker) instead of being cancelled."""
+    import asyncio
+    import time
+    from app.infrastructure import external_api
+    from app.infrastructure.rate_limiter import Priority
+
+    api = external_api.SportMonksAPI()
+    api.breaker = external_api.CircuitBreaker("test", failure_threshold=1, reset_timeout=60)
+
+    async def hangs(*args, **kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(external_api, "budgeted_get", hangs)
+    started = time.monotonic()
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(api._get_json(
+            "fixture", Priority.LIVE, "https://sportmonks.test/fixtures/0", {}, 5,
+            deadline=started + 0.2
+        ))
+    assert time.monotonic() - started < 1
+    assert api.breaker.state == "open"
+
+# Compiled Content Filter Tests
+
+def test_compiled_filter_matches_keyword_scan():
+    """Test that the compiled filter agrees with the plain keyword scan it replaced."""
+    import re
+    from app.services.normalizers.engagement_normalizer import (
+        ContentFilter, BLACKLIST_KEYWORDS, CRICKET_CONTEXT_WORDS
+    )
+
+    def reference(text):
+        text_lower = text.lower()
+        if any(word in text_lower for word in BLACKLIST_KEYWORDS):
+            return False
+        return bool(set(re.split(r'\W+', text_lower)).intersection(CRICKET_CONTEXT_WORDS))
+
+    content_filter = ContentFilter(BLACKLIST_KEYWORDS, CRICKET_CONTEXT_WORDS)
+    samples = [
+        "What an innings!", "overthrow for four", "Over and out", "#BBL15 final tonight",
+        "bodyline series", "Playing in the rain", "vs.", "DM for betting id", "t20cricket_fan",
+        "six-hitting masterclass", "ipl2025", "Run-out!", "random text", "cup",
+    ]
+    for text in samples:
+        assert content_filter.is_valid(text) == reference(text), text
+
+def test_content_filter_hot_reload(tmp_path, monkeypatch):
+    """Test that vocabularies are reloaded from CONTENT_FILTER_PATH without a restart."""
+    import json
+    from app.core.config import settings
+    from app.services.normalizers import engagement_normalizer as en
+
+    vocab_file = tmp_path / "vocab.json"
+    vocab_file.write_text(json.dumps({"blacklist": ["spoiler"], "context": ["baseball"]}))
+    monkeypatch.setattr(settings, "CONTENT_FILTER_PATH", str(vocab_file))
+    # monkeypatch restores the module-level filter state afterwards
+    monkeypatch.setattr(en, "_content_filter", en._content_filter)
+    monkeypatch.setattr(en, "_filter_mtime", en._filter_mtime)
+    monkeypatch.setattr(en, "_filter_checked_at", en._filter_checked_at)
+    en.reload_content_filter(force=True)
+
+    assert en.is_valid_content("baseball tonight") is True
+    assert en.is_valid_content("cricket match spoiler") is False
+
+# Streaming Timeline Tests
+
+def test_twitter_timeline_streams_posts_and_cursor():
+    """Test that streamed raw bytes yield the same posts and bottom cursor as the decoded dict."""
+    import json
+    from app.services.normalizers import engagement_normalizer as en
+
+    def entry(i, text):
+        return {"entryId": f"tweet-{i}", "content": {"content": {"tweet_results": {"result": {
+            "rest_id": str(i),
+            "legacy": {"full_text": text, "favorite_count": 3, "retweet_count": 1},
+            "details": {"created_at_ms": 1700000000000 + i},
+            "core": {"user_results": {"result": {"core": {"name": "Fan", "screen_name": "fan"}}}},
+        }}}}}
+
+    payload = {"result": {"timeline_response": {"timeline": {"instructions": [
+        {"__typename": "TimelineAddEntries", "entries": [
+            entry(1, "Great cricket match"), entry(2, "casino jackpot cricket"), entry(3, "Six to win it!"),
+            {"entryId": "cursor-bottom-0", "content": {"cursorType": "Bottom", "value": "NEXT"}},
+        ]},
+    ]}}}}
+    raw = json.dumps(payload).encode()
+
+    expected = [p.source_id for p in en.normalize_twitter_response(payload)]
+    assert expected == ["1", "3"]
+
+    timeline = en.TwitterTimeline(raw)
+    assert [p.source_id for p in timeline] == expected
+    assert timeline.cursor == "NEXT"
+    assert (timeline.entries, timeline.posts) == (3, 2)
+    assert list(en.TwitterTimeline(b"")) == []
+
+    # Entries of other instruction types aren't posts in either path, wherever __typename sits
+    payload["result"]["timeline_response"]["timeline"]["instructions"][:0] = [
+        {"entries": [entry(4, "Pinned cricket match")], "__typename": "TimelinePinEntry"},
+        {"__typename": "TimelineReplaceEntries", "entries": [entry(5, "Replaced cricket match")]},
+    ]
+    kinds = [(kind, e["entryId"]) for kind, e in en.iter_timeline_entries(payload)]
+    assert [(kind, e["entryId"]) for kind, e in en.iter_timeline_entries(json.dumps(payload).encode())] == kinds
+    assert kinds[:2] == [("replace", "tweet-4"), ("replace", "tweet-5")]
+    assert [p.source_id for p in en.TwitterTimeline(json.dumps(payload).encode())] == expected
+
+# Ranked Feed Tests
+
+def test_engagement_score_decays_by_half_life():
+    """Test that one half-life of age is worth exactly double the engagement."""
+    from datetime import datetime, timedelta, timezone
+    from app.domain.models.engagement import EngagementMetrics
+    from app.services.engagement_ranking import engagement_score, HALF_LIFE_SECONDS
+
+    now = datetime(2025, 7, 1, tzinfo=timezone.utc)
+    older = now - timedelta(seconds=HALF_LIFE_SECONDS)
+
+    fresh = engagement_score(EngagementMetrics(likes=99), now)
+    assert abs(engagement_score(EngagementMetrics(likes=199), older) - fresh) < 1e-9
+    # Viral but stale loses to moderate and fresh; more engagement at equal age wins
+    assert engagement_score(EngagementMetrics(likes=10000), now - timedelta(days=7)) < fresh
+    assert engagement_score(EngagementMetrics(likes=10, shares=50, views=10**6), now) > fresh
+
+# Engagement Ingest Tests
+
+def test_failed_store_does_not_advance_high_water_mark(monkeypatch, db_module_import):
+    """Test that a query whose DB write fails keeps its old high-water mark, while others advance."""
+    import asyncio
+    from app.core.config import settings
+    from app.domain.models.engagement import EngagementPostDomain, EngagementAuthor, EngagementMetrics
+    from app.services import engagement_service as es
+
+    def post(source_id, day):
+        return EngagementPostDomain(
+            source="twitter", source_id=source_id, url="https://twitter.com/x", author=EngagementAuthor(name="Fan"),
+            metrics=EngagementMetrics(), published_at=datetime(2025, 7, day), fetched_at=datetime(2025, 7, day)
+        )
+
+    async def pages(query, since, paging):
+        yield [post(f"{query}-new", 3), post(f"{query}-old", 2)]
+
+    async def run_db(fn, batch):
+        if batch[0].source_id.startswith("#broken"):
+            raise RuntimeError("connection reset")
+        return len(batch)
+
+    class FakeRedis:
+        def __init__(self):
+            self.marks = {"#ok": "2025-07-01T00:00:00", "#broken": "2025-07-01T00:00:00"}
+        async def hgetall(self, key):
+            return dict(self.marks) if key.startswith("engagement:cursor:") else {}
+        async def hset(self, key, mapping):
+            assert key.startswith("engagement:cursor:")
+            self.marks.update(mapping)
+
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(settings, "TWITTER_QUERIES", "#ok|#broken")
+    monkeypatch.setattr(es, "_twitter_pages", pages)
+    monkeypatch.setattr(es, "run_db", run_db)
+    monkeypatch.setattr(es, "redis_async", fake_redis)
+
+    asyncio.run(es.fetch_and_store_engagement("twitter"))
+    assert fake_redis.marks == {"#ok": "2025-07-03T00:00:00", "#broken": "2025-07-01T00:00:00"}
+
+    # The store itself rolls back and re-raises instead of reporting 0 saved
+    import pytest
+
+    class FailingSession:
+        rolled_back = False
+        def execute(self, stmt):
+            raise RuntimeError("connection reset")
+        def rollback(self):
+            self.rolled_back = True
+
+    session = FailingSession()
+    with pytest.raises(RuntimeError):
+        es.store_engagement_posts(session, [post("#ok-1", 4)])
+    assert session.rolled_back
+
+def test_page_cap_keeps_high_water_mark_until_gap_is_read(monkeypatch, db_module_import):
+    """Test that a query stopped by ENGAGEMENT_MAX_PAGES resumes from its cursor before its mark moves."""
+    import asyncio
+    from app.core.config import settings
+    from app.domain.models.engagement import EngagementPostDomain, EngagementAuthor, EngagementMetrics
+    from app.services import engagement_service as es
+
+    def post(day):
+        return EngagementPostDomain(
+            source="twitter", source_id=f"t{day}", url="https://twitter.com/x", author=EngagementAuthor(name="Fan"),
+            metrics=EngagementMetrics(), published_at=datetime(2025, 7, day), fetched_at=datetime(2025, 7, day)
+        )
+
+    # Newest first; each page's bottom cursor points at the next one
+    feed = {None: ([post(10), post(9)], "c1"), "c1": ([post(8), post(7)], "c2"), "c2": ([post(6), post(5)], "c3")}
+    requested = []
+
+    class Page:
+        def __init__(self, cursor):
+            self.posts, self.cursor = feed[cursor]
+            self.truncated = False
+        def __iter__(self):
+            return iter(self.posts)
+
+    class FakeSocialAPI:
+        async def fetch_twitter_search_raw(self, query, count=20, cursor=None):
+            requested.append(cursor)
+            return cursor
+
+    async def run_db(fn, batch):
+        return len(batch)
+
+    class FakeRedis:
+        def __init__(self):
+            self.hashes = {"engagement:cursor:twitter": {"#MLC": "2025-07-05T00:00:00"}}
+        async def hgetall(self, key):
+            return dict(self.hashes.get(key, {}))
+        async def hset(self, key, mapping):
+            self.hashes.setdefault(key, {}).update(mapping)
+        async def hdel(self, key, *fields):
+            for field in fields:
+                self.hashes.get(key, {}).pop(field, None)
+
+    fake_redis = FakeRedis()
+    monkeypatch.setattr(settings, "TWITTER_QUERIES", "#MLC")
+    monkeypatch.setattr(settings, "ENGAGEMENT_MAX_PAGES", 2)
+    monkeypatch.setattr(es, "social_api", FakeSocialAPI())
+    monkeypatch.setattr(es, "TwitterTimeline", Page)
+    monkeypatch.setattr(es, "run_db", run_db)
+    monkeypatch.setattr(es, "redis_async", fake_redis)
+
+    since = datetime(2025, 7, 5)
+    fetched, saved, newest, reached_since, resume_cursor = asyncio.run(es.ingest_query("twitter", "#MLC", since))
+    assert (fetched, newest, reached_since, resume_cursor) == (4, datetime(2025, 7, 10), False, "c2")
+
+    # Capped run: mark stays, the gap is remembered
+    requested.clear()
+    asyncio.run(es.fetch_and_store_engagement("twitter"))
+    assert fake_redis.hashes["engagement:cursor:twitter"] == {"#MLC": "2025-07-05T00:00:00"}
+    assert "#MLC" in fake_redis.hashes["engagement:resume:twitter"]
+
+    # Next run reads the gap only, then moves the mark to the newest post of the first run
+    requested.clear()
+    asyncio.run(es.fetch_and_store_engagement("twitter"))
+    assert requested == ["c2"]
+    assert fake_redis.hashes["engagement:cursor:twitter"] == {"#MLC": "2025-07-10T00:00:00"}
+    assert fake_redis.hashes["engagement:resume:twitter"] == {}
+
+# Schedule Sync Tests
+
+def test_pick_sync_window_uses_per_window_high_water_marks(db_module_import):
+    """Test full-window staleness, hot-band skipping within its interval, and forcing."""
+    from datetime import timedelta
+    from app.core.config import settings
+    from app.services.schedule_service import pick_sync_window
+
+    now = datetime(2025, 7, 10, 12, 0)
+    recent = now - timedelta(minutes=1)
+    assert pick_sync_window(None, None, now)[0] == "full"
+    assert pick_sync_window(now - timedelta(hours=settings.SCHEDULE_FULL_SYNC_HOURS), recent, now)[0] == "full"
+    assert pick_sync_window(recent, recent, now, force_full=True)[0] == "full"
+
+    # Full window fresh: hot band only when its own mark is due
+    assert pick_sync_window(recent, recent, now) is None
+    assert pick_sync_window(recent, recent, now, force_hot=True)[0] == "hot"
+    window, start, end = pick_sync_window(recent, now - timedelta(minutes=settings.SCHEDULE_HOT_SYNC_MINUTES), now)
+    assert window == "hot"
+    assert (start, end) == (
+        now.date() - timedelta(days=settings.SCHEDULE_HOT_PAST_DAYS),
+        now.date() + timedelta(days=settings.SCHEDULE_HOT_FUTURE_DAYS),
+    )
+
+# Single-flight Tests
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Test that concurrent callers for one key share a single run, and the key frees up afterwards."""
+    import asyncio
+    from app.infrastructure.single_flight import SingleFlight
+
+    flight = SingleFlight()
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.01)
+        return "detail"
+
+    async def main():
+        results = await asyncio.gather(*(flight.do("match:1", fetch) for _ in range(10)))
+        assert not flight.is_running("match:1")
+        return results
+
+    assert asyncio.run(main()) == ["detail"] * 10
+    assert len(runs) == 1
+
+class _LockRedis:
+    """Just enough of Redis for the lock helpers: SET NX and the compare-and-delete script."""
+    def __init__(self):
+        self.data = {}
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+    async def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+def test_redis_lock_winner_runs_peer_waits_and_release_is_token_guarded(monkeypatch):
+    """Test cross-worker single-flight: one run, the peer reads its result, and only the owner's token releases."""
+    import asyncio
+    from app.infrastructure import single_flight as sf
+
+    fake = _LockRedis()
+    monkeypatch.setattr(sf, "redis_async", fake)
+    stored = {}
+    runs = []
+
+    async def fetch():
+        runs.append(1)
+        await asyncio.sleep(0.15)
+        stored["detail"] = "fresh"
+        return "fresh"
+
+    async def peer_result():
+        return stored.get("detail")
+
+    async def main():
+        return await asyncio.gather(
+            sf.run_with_redis_lock("detail", fetch, peer_result),
+            sf.run_with_redis_lock("detail", fetch, peer_result),
+        )
+
+    assert asyncio.run(main()) == ["fresh", "fresh"]
+    assert len(runs) == 1 and "lock:detail" not in fake.data
+
+    # A lock that expired and was re-taken by a peer survives our late release
+    fake.data["lock:detail"] = "peer-token"
+    asyncio.run(sf.release_lock("lock:detail", "our-token"))
+    assert fake.data["lock:detail"] == "peer-token"
+
+# Highlights Negative-cache Tests
+
+def test_highlights_backoff_and_due(db_module_import):
+    """Test the doubling, capped retry delay and when a finished match is due another search."""
+    from app.core.config import settings
+    from app.services.match_detail_service import highlights_retry_delay, highlights_search_due
+
+    base, cap = settings.HIGHLIGHTS_RETRY_BASE_SECONDS, settings.HIGHLIGHTS_RETRY_MAX_SECONDS
+    assert [highlights_retry_delay(n) for n in (1, 2, 3)] == [base, 2 * base, 4 * base]
+    assert highlights_retry_delay(50) == cap
+
+    finished = {"status": "Finished", "highlights_url": None}
+    assert highlights_search_due(finished, None, now=1000) is True
+    assert highlights_search_due(finished, {"url": None, "attempts": 2, "next_retry": 900}, now=1000) is True
+    assert highlights_search_due(finished, {"url": None, "attempts": 2, "next_retry": 1100}, now=1000) is False
+    assert highlights_search_due(finished, {"url": "https://youtu.be/x", "attempts": 1}, now=1000) is False
+    assert highlights_search_due({"status": "Live", "highlights_url": None}, None, now=1000) is False
+    assert highlights_search_due({"status": "Finished", "highlights_url": "https://youtu.be/x"}, None, now=1000) is False
+
+def test_highlights_budget_refusal_keeps_backoff_state(monkeypatch, db_module_import):
+    """Test that a search refused by the YouTube budget leaves attempts/next_retry untouched."""
+    import asyncio
+    from app.infrastructure.rate_limiter import BudgetExceeded, Priority
+    from app.services import match_detail_service as mds
+
+    writes = []
+
+    async def acquire_lock(key, ttl):
+        return "token"
+
+    async def release_lock(key, token):
+        pass
+
+    async def redis_get_json(key):
+        return {"url": None, "attempts": 3, "next_retry": 0}
+
+    async def refused(*args):
+        raise BudgetExceeded("youtube", Priority.HIGHLIGHTS, 60)
+
+    async def set_json(key, value, ttl=None):
+        writes.append(value)
+
+    monkeypatch.setattr(mds, "acquire_lock", acquire_lock)
+    monkeypatch.setattr(mds, "release_lock", release_lock)
+    monkeypatch.setattr(mds, "redis_get_json", redis_get_json)
+    monkeypatch.setattr(mds, "fetch_and_store_highlights", refused)
+    monkeypatch.setattr(mds.cache, "set_json", set_json)
+
+    query = {"db_id": 1, "team1": "A", "team2": "B", "starting_at": None}
+    asyncio.run(mds._search_highlights("99", query))
+    assert writes == []
+
+# Adaptive Scheduler Tests
+
+def test_live_poll_interval_follows_match_state(db_module_import):
+    """Test the live cadence for in-play, break-only, idle and overdue-kickoff states."""
+    from datetime import timedelta
+    from app.core.config import settings
+    from app.services.scheduler import live_poll_interval
+
+    now = datetime(2025, 7, 10, 12, 0)
+    live, brk, idle = settings.LIVE_POLL_INTERVAL_LIVE, settings.LIVE_POLL_INTERVAL_BREAK, settings.LIVE_POLL_INTERVAL_IDLE
+
+    assert live_poll_interval(["Innings Break", "2nd Innings"], None, now) == live
+    assert live_poll_interval(["Innings Break"], None, now) == brk
+    assert live_poll_interval([], None, now) == idle
+    # Far-off kickoff: capped at idle; approaching: half the remaining time; close or overdue: break cadence
+    assert live_poll_interval([], now + timedelta(days=1), now) == idle
+    assert live_poll_interval([], now + timedelta(seconds=4 * brk), now) == 2 * brk
+    assert live_poll_interval([], now + timedelta(seconds=10), now) == brk
+    assert live_poll_interval([], now - timedelta(minutes=20), now) == brk
+
+def test_scheduler_falls_back_to_job_base_interval(monkeypatch, db_module_import):
+    """Test that a failing interval policy keeps the job's own cadence rather than the live idle one."""
+    import asyncio
+    from app.services import scheduler as sc
+
+    class Stop(Exception):
+        pass
+
+    async def sleep(seconds):
+        raise Stop
+
+    class FakeRedis:
+        async def hset(self, *args):
+            pass
+
+    async def job():
+        return None
+
+    async def broken_interval(_result):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(sc.asyncio, "sleep", sleep)
+    monkeypatch.setattr(sc, "jittered", lambda seconds: seconds)
+    monkeypatch.setattr(sc, "redis_async", FakeRedis())
+
+    scheduler = sc.Scheduler()
+    scheduler.register("news", job, broken_interval, base_interval=240 * 60)
+    with pytest.raises(Stop):
+        asyncio.run(scheduler.run("news"))
+    assert scheduler._state["news"]["interval_s"] == 240 * 60
@@ -0,0 +1,87 @@
+# Run from backend/: python bench_content_filter.py [posts] [extra_keywords]
+# Throughput of the engagement content filter: the old per-keyword scan + re.split
+# vs the compiled ContentFilter. The corpus is synthetic (cricket, spam and neutral
+# posts); extra_keywords inflates both vocabularies to show how each scales.
+import random
+import re
+import sys
+import time
+
+from app.services.normalizers.engagement_normalizer import (
+    ContentFilter, BLACKLIST_KEYWORDS, CRICKET_CONTEXT_WORDS
+)
+
+CRICKET = [
+    "What a finish! {team} win the final by 4 wickets #MLC2025",
+    "Century for the opener, 104 off 58 balls. Incredible innings vs {team}",
+    "Highlights: {team} bowling attack rips through the top order",
+    "Six! Six! Six! Last over drama in the #BBL15 match tonight",
+]
+SPAM = [
+    "DM for betting id, best casino odds {team}",
+    "Giveaway!!! follow me and win a jackpot prize",
+    "Cosmetic surgery deals this week only, whatsapp now",
+]
+NEUTRAL = [
+    "Just had the best coffee of my life in {team} town",
+    "New phone who dis, loving the camera so far",
+    "Traffic on the bridge again, leaving early today",
+]
+TEAMS = ["Texas Super Kings", "MI New York", "Seattle Orcas", "Sydney Sixers", "Perth Scorchers"]
+
+
+def make_corpus(n: int) -> list[str]:
+    rng = random.Random(42)
+    pools = [CRICKET, SPAM, NEUTRAL]
+    corpus = []
+    for _ in range(n):
+        template = rng.choice(rng.choice(pools))
+        # Pad to a realistic tweet length
+        filler = " ".join(rng.choice(["so", "good", "today", "really", "wow", "lol", "amazing"]) for _ in range(15))
+        corpus.append(f"{template.format(team=rng.choice(TEAMS))} {filler}")
+    return corpus
+
+
+def legacy_is_valid(text: str, blacklist: set[str], context: set[str]) -> bool:
+    # The filter as it was before ContentFilter
+    if not text:
+        return False
+    text_lower = text.lower()
+    if any(word in text_lower for word in blacklist):
+        return False
+    words = set(re.split(r'\W+', text_lower))
+    if not words.intersection(context):
+        return False
+    return True
+
+
+def posts_per_second(fn, corpus: list[str]) -> float:
+    start = time.process_time()
+    for text in corpus:
+        fn(text)
+    return len(corpus) / max(time.process_time() - start, 1e-9)
+
+
+def main():
+    n_posts = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    extra = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    corpus = make_corpus(n_posts)
+
+    print(f"{n_posts} synthetic posts, posts/s of CPU time")
+    print(f"{'vocabulary':<26}{'before':>12}{'after':>12}{'speedup':>10}")
+    for extra_words in sorted({0, 200, extra}):
+        blacklist = set(BLACKLIST_KEYWORDS) | {f"spamword{i}" for i in range(extra_words)}
+        context = set(CRICKET_CONTEXT_WORDS) | {f"cricketterm{i}" for i in range(extra_words)}
+        compiled = ContentFilter(blacklist, context)
+
+        mismatches = sum(compiled.is_valid(t) != legacy_is_valid(t, blacklist, context) for t in corpus)
+        assert mismatches == 0, f"{mismatches} posts classified differently"
+
+        b = posts_per_second(lambda t: legacy_is_valid(t, blacklist, context), corpus)
+        a = posts_per_second(compiled.is_valid, corpus)
+        label = f"{len(blacklist)} blacklist/{len(context)} ctx"
+        print(f"{label:<26}{b:>12.0f}{a:>12.0f}{a / max(b, 1e-9):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
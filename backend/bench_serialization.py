@@ -0,0 +1,97 @@
+# Run from backend/: python bench_serialization.py [iterations]
+# Per-request CPU for the hot read paths, stdlib json + FastAPI encoding vs app.core.serialization.
+# Payloads are synthetic but shaped like production values (10 live matches, a full scorecard).
+import json
+import sys
+import time
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import serialization
+from app.domain.models.live import LiveMatch, InningScore
+
+
+def make_live_snapshots(n: int = 10) -> list[str]:
+    snapshots = []
+    for i in range(n):
+        match = LiveMatch(
+            match_id=60000 + i,
+            status="2nd Innings",
+            note="Target 187 runs",
+            innings=[
+                InningScore(inning=1, team_id=10 + i, score=186, wickets=7, overs=20.0),
+                InningScore(inning=2, team_id=20 + i, score=94, wickets=3, overs=11.4),
+            ],
+            toss_won_team_id=10 + i,
+            toss_elected="batting",
+            current_batting_team_id=20 + i,
+            last_updated=datetime(2025, 1, 1, 12, 0, 0),
+        )
+        snapshots.append(json.dumps(match.model_dump(), default=str))
+    return snapshots
+
+
+def make_detail_payload() -> dict:
+    player = {"id": 1, "name": "Player Name", "image": "https://cdn.example/p.png", "position": "Batsman",
+              "is_captain": False, "is_keeper": False}
+    batting = [{"player": player, "runs": 45, "balls": 30, "fours": 4, "sixes": 2, "strike_rate": 150.0,
+                "status": "out", "dismissal_text": "c Keeper b Bowler"} for _ in range(11)]
+    bowling = [{"player": player, "overs": 4.0, "runs_conceded": 32, "wickets": 2, "economy": 8.0} for _ in range(6)]
+    balls = [{"over": f"{o}.{b}", "batsman_name": "Batter", "bowler_name": "Bowler", "runs": 1,
+              "is_wicket": False, "is_four": False, "is_six": False, "extra_type": None}
+             for o in range(20) for b in range(1, 7)]
+    innings = [{"inning_number": n, "team_id": n, "team_name": f"Team {n}", "batting": batting,
+                "bowling": bowling, "balls": balls} for n in (1, 2)]
+    return {"match_id": 60000, "status": "Finished", "innings": innings, "highlights_url": None,
+            "starting_at": datetime(2025, 1, 1, 10, 0, 0)}
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    snapshots = make_live_snapshots()
+    detail = make_detail_payload()
+    detail_text = json.dumps(detail, default=str)
+
+    cases = {
+        # Before: MGET -> json.loads each -> FastAPI jsonable_encoder -> json.dumps
+        # After: stored text spliced into the body
+        "/live": (
+            lambda: json.dumps(jsonable_encoder({"data": [json.loads(s) for s in snapshots]})),
+            lambda: '{"data":[' + ",".join(snapshots) + "]}",
+        ),
+        # Before: cached dict -> jsonable_encoder -> json.dumps; After: one fast dumps
+        "/{match_id}": (
+            lambda: json.dumps(jsonable_encoder(detail)),
+            lambda: serialization.dumps(detail),
+        ),
+        # Redis value round-trip (set_json + get_json)
+        "redis set+get": (
+            lambda: json.loads(json.dumps(detail, default=str)),
+            lambda: serialization.loads(serialization.dumps(detail)),
+        ),
+        # Cached engagement feed hit: decode + re-encode vs verbatim text
+        "engagement feed hit": (
+            lambda: json.dumps(jsonable_encoder(json.loads(detail_text))),
+            lambda: detail_text,
+        ),
+    }
+
+    backend = "orjson" if serialization.orjson is not None else "stdlib json (orjson not installed)"
+    print(f"serializer: {backend}, {iterations} iterations, CPU us per call")
+    print(f"{'path':<22}{'before':>10}{'after':>10}{'speedup':>10}")
+    for name, (before, after) in cases.items():
+        b = cpu_per_call(before, iterations)
+        a = cpu_per_call(after, iterations)
+        print(f"{name:<22}{b:>10.1f}{a:>10.1f}{b / max(a, 1e-9):>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()